@@ -1,22 +1,33 @@
 """
 Enhanced data extraction helper for parsing user messages into structured slots.
 """
+import copy
 import json
 import logging
 import re
-from typing import Dict, Any, List
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Tuple
 
 from app.schemas import ConversationIntent
-from app.core.llm_client import get_factual_llm
+from app.core.llm_client import get_json_llm
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of (field, message) LLM extraction results kept in memory
+LLM_FIELD_CACHE_SIZE = 512
+
 
 class DataExtractor:
     """Enhanced data extractor for user messages."""
     
     def __init__(self):
-        self.factual_llm = get_factual_llm()
+        self.json_llm = get_json_llm()
+        # LRU cache of LLM fallback results keyed by (field, normalized message).
+        # The factual LLM runs at temperature 0, so a repeated message yields the
+        # same extraction and the round-trip can be skipped.
+        self._llm_field_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._llm_field_cache_lock = threading.Lock()
     
     def extract_travel_data(
         self, 
@@ -412,50 +423,62 @@ class DataExtractor:
     ) -> Dict[str, Any]:
         """Extract a specific field using LLM with appropriate prompt."""
         
+        cache_key = (field, " ".join(user_message.split()))
+        with self._llm_field_cache_lock:
+            cached = self._llm_field_cache.get(cache_key)
+            if cached is not None:
+                self._llm_field_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.debug(f"LLM extraction cache hit for {field}")
+            return copy.deepcopy(cached)
+        
         prompts = {
             "user_preferences": f"""Extract user travel preferences from this message: "{user_message}"
 
-Analyze the message and identify travel preferences. Return as JSON list.
+Analyze the message and identify travel preferences. Return a JSON object with a "user_preferences" list.
 
 Common preferences: romantic, luxury, budget, adventure, cultural, relaxing, family-friendly, beaches, mountains, urban, nature, nightlife, food, art, warm, cool
 
-Example: "family-friendly resort with beaches" → ["family-friendly", "luxury", "beaches"]
+Example: "family-friendly resort with beaches" → {{"user_preferences": ["family-friendly", "luxury", "beaches"]}}
 
 JSON response:""",
 
             "destination": f"""Extract the specific destination (city/country/region) from this message: "{user_message}"
 
 Look for the actual place name the person wants to visit. Ignore descriptive words.
+Return a JSON object with a "destination" string.
 
 Examples:
-- "attractions in Paris" → "Paris"
-- "outdoor activities near Barcelona" → "Barcelona"  
-- "museums in London" → "London"
-- "things to do in Tokyo for families" → "Tokyo"
+- "attractions in Paris" → {{"destination": "Paris"}}
+- "outdoor activities near Barcelona" → {{"destination": "Barcelona"}}
+- "museums in London" → {{"destination": "London"}}
+- "things to do in Tokyo for families" → {{"destination": "Tokyo"}}
 
 JSON response:""",
 
             "date_range": f"""Extract travel time information from this message: "{user_message}"
 
 Look for any time-related information. Parse flexible expressions.
+Return a JSON object with a "date_range" object.
 
 Examples:
-- "for a week" → {{"duration_days": 7}}
-- "in summer" → {{"season": "Summer"}}
-- "visiting for 3 days" → {{"duration_days": 3}}
-- "in June for 10 days" → {{"month": "June", "duration_days": 10}}
+- "for a week" → {{"date_range": {{"duration_days": 7}}}}
+- "in summer" → {{"date_range": {{"season": "Summer"}}}}
+- "visiting for 3 days" → {{"date_range": {{"duration_days": 3}}}}
+- "in June for 10 days" → {{"date_range": {{"month": "June", "duration_days": 10}}}}
 
 JSON response:""",
 
             "travelers": f"""Extract number of travelers from this message: "{user_message}"
 
 Count adults and children traveling. Make reasonable assumptions.
+Return a JSON object with a "travelers" object.
 
 Examples:
-- "family of 4" → {{"adults": 2, "kids": 2}}
-- "me and my wife" → {{"adults": 2, "kids": 0}}
-- "solo travel" → {{"adults": 1, "kids": 0}}
-- "2 adults and 3 kids" → {{"adults": 2, "kids": 3}}
+- "family of 4" → {{"travelers": {{"adults": 2, "kids": 2}}}}
+- "me and my wife" → {{"travelers": {{"adults": 2, "kids": 0}}}}
+- "solo travel" → {{"travelers": {{"adults": 1, "kids": 0}}}}
+- "2 adults and 3 kids" → {{"travelers": {{"adults": 2, "kids": 3}}}}
 
 JSON response:"""
         }
@@ -465,53 +488,32 @@ JSON response:"""
         
         try:
             prompt = prompts[field]
-            response = self.factual_llm.invoke(prompt)
+            response = self.json_llm.invoke(prompt)
             logger.debug(f"LLM response for {field}: {response}")
             
-            # Clean and parse the response
-            response = response.strip()
-            
-            # Remove any markdown formatting
-            if response.startswith("```") and response.endswith("```"):
-                lines = response.split('\n')
-                response = '\n'.join(lines[1:-1])
-            elif response.startswith("```json"):
-                response = response[7:]
-            if response.endswith("```"):
-                response = response[:-3]
-            
-            # Remove common prefixes that LLMs might add
-            response = response.strip()
-            if response.startswith("JSON response:"):
-                response = response[14:].strip()
-            if response.startswith("Response:"):
-                response = response[9:].strip()
-            
-            # Try to extract JSON from response if it contains other text
-            import re
-            json_match = re.search(r'(\{.*\}|\[.*\])', response, re.DOTALL)
-            if json_match:
-                response = json_match.group(1)
+            # JSON mode guarantees a single JSON object keyed by the requested field
+            parsed = json.loads(response)
+            value = parsed.get(field) if isinstance(parsed, dict) else None
             
-            # Parse JSON response
+            result = {}
             if field == "user_preferences":
-                preferences = json.loads(response)
-                if isinstance(preferences, list) and preferences:
-                    return {"user_preferences": preferences}
+                if isinstance(value, list) and value:
+                    result = {"user_preferences": value}
             elif field == "destination":
-                destination = json.loads(response)
-                if isinstance(destination, str) and destination:
-                    return {"destination": destination}
-            elif field == "date_range":
-                date_info = json.loads(response)
-                if isinstance(date_info, dict) and date_info:
-                    return {"date_range": date_info}
-            elif field == "travelers":
-                travelers = json.loads(response)
-                if isinstance(travelers, dict) and travelers:
-                    return {"travelers": travelers}
+                if isinstance(value, str) and value:
+                    result = {"destination": value}
+            elif field in ("date_range", "travelers"):
+                if isinstance(value, dict) and value:
+                    result = {field: value}
             
-            return {}
+            # Only successful extractions are cached so transient LLM failures are retried
+            if result:
+                with self._llm_field_cache_lock:
+                    self._llm_field_cache[cache_key] = copy.deepcopy(result)
+                    if len(self._llm_field_cache) > LLM_FIELD_CACHE_SIZE:
+                        self._llm_field_cache.popitem(last=False)
+            
+            return result
             
         except (json.JSONDecodeError, Exception) as e:
             logger.warning(f"Failed to parse LLM response for {field}: {e}")
@@ -1,10 +1,18 @@
 """
 Enhanced orchestrator for structured conversation flow with tool integration.
 """
-import json
+import hashlib
 import logging
-from typing import Dict, Any, List
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from types import MappingProxyType
+from typing import Dict, Any, List, Tuple
 
+import orjson
+from sqlalchemy import event, func
 from sqlalchemy.orm import Session
 from app.core.llm_client import get_llm
 from app.agents.validator import get_validator
@@ -21,9 +29,123 @@ from app.schemas.state import ConversationStateManager
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of conversations whose latest snapshot data is kept in memory
+SNAPSHOT_DATA_CACHE_SIZE = 10_000
+
+# Shared pool for the second of two independent tool lookups (HTTP/LLM bound); the
+# first runs on the request thread, so each request holds at most one worker.
+# Sized to the server's request threadpool (anyio's default of 40 threads) so one
+# request's slow LLM call never queues behind another's
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=40, thread_name_prefix="orchestrator-tool")
+
+# Questions asked for missing slots, per service
+_TARGETED_QUESTIONS = MappingProxyType({
+    ConversationIntent.PACKING_LIST: {
+        "destination": "What's your destination?",
+        "date_range": "When are you traveling? (dates or duration)",
+        "travelers": "How many people are traveling and what are their ages?",
+    },
+    ConversationIntent.DESTINATION_RECOMMENDATION: {
+        "interests": "What type of activities or experiences are you looking for?",
+        "date_range": "When are you planning to travel?",
+        "travelers": "How many people will be traveling?",
+    },
+    ConversationIntent.ATTRACTIONS: {
+        "destination": "Which city would you like attraction suggestions for?",
+        "visit_duration": "How many days will you be visiting?",
+    }
+})
+
+# Keyword sets used to decide whether a detected intent change is a real transition
+_SIMPLE_CONFIRMATIONS = frozenset(["yes", "ok", "sure", "please", "go ahead", "continue", "proceed"])
+_SERVICE_CONTINUATIONS = MappingProxyType({
+    ConversationIntent.PACKING_LIST: ("generate", "create", "make", "show me", "give me"),
+    ConversationIntent.DESTINATION_RECOMMENDATION: ("recommend", "suggest", "find"),
+    ConversationIntent.ATTRACTIONS: ("show", "tell me", "list")
+})
+_SERVICE_KEYWORDS = MappingProxyType({
+    ConversationIntent.ATTRACTIONS: ("attractions", "activities", "things to do", "museums"),
+    ConversationIntent.PACKING_LIST: ("packing", "pack", "luggage"),
+    ConversationIntent.DESTINATION_RECOMMENDATION: ("destination", "place", "where")
+})
+_TRANSITION_INDICATORS = ("now", "also", "but", "however", "actually", "instead", "i would love")
+
+# Phrases that mean the user is happy with the recommendations, matched in one scan
+_FINALIZE_SIGNALS = re.compile(
+    "|".join(re.escape(signal) for signal in (
+        "looks good", "perfect", "thanks", "that's great", "no changes", "finalize"
+    )),
+    re.IGNORECASE
+)
+
+# Session.info key for cache updates that only apply once the session commits
+_PENDING_CACHE_UPDATES = "orchestrator_pending_cache_updates"
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_cache_updates(session: Session):
+    """Apply cache updates for snapshots that are now committed."""
+    for update in session.info.pop(_PENDING_CACHE_UPDATES, ()):
+        update()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_cache_updates(session: Session):
+    """Drop cache updates for snapshots that were rolled back."""
+    session.info.pop(_PENDING_CACHE_UPDATES, None)
+
+
+# Serialized empty pending-questions list stored on every snapshot
+_NO_PENDING_QUESTIONS = "[]"
+
+
+def _build_initial_prompt(intent: ConversationIntent) -> str:
+    """Build the opening message for a service with nothing collected yet."""
+    service_description = ConversationStateManager.get_service_description(intent)
+    questions = ConversationStateManager.get_prioritized_questions(
+        intent, [], max_questions=2
+    )
+    
+    if questions:
+        questions_text = "\n".join([f"• {q}" for q in questions])
+        return f"Perfect! {service_description}\n\nTo get started:\n{questions_text}"
+    return f"Great! {service_description}"
+
+
+# Opening message per service; it only depends on the intent, so build it once
+_INITIAL_PROMPT_BY_INTENT = MappingProxyType({
+    intent: _build_initial_prompt(intent)
+    for intent in ConversationIntent
+    if intent != ConversationIntent.GENERAL
+})
+
+# Data fields carried over when switching between services
+_SHAREABLE_FIELDS = (
+    "destination", "travelers", "date_range", "user_preferences", 
+    "budget_band", "climate_preference", "activities_planned",
+    "family_composition", "interests", "names", "ages", "budget_info",
+    "travel_style", "special_requirements", "packing_context"
+)
+
+# Human-readable service names, e.g. "Packing List" / "packing list"
+_DISPLAY_NAME = MappingProxyType({
+    intent: intent.value.replace("_", " ").title() for intent in ConversationIntent
+})
+_DISPLAY_NAME_LC = MappingProxyType({
+    intent: name.lower() for intent, name in _DISPLAY_NAME.items()
+})
+
+# Shared read-only stand-in for missing nested dicts in conversation data
+_EMPTY = MappingProxyType({})
+
+# Marks "snapshot not fetched yet", since None means the conversation has no snapshot
+_NOT_LOADED = object()
+
 
 class AgentResponse:
     """Enhanced response from the orchestrator."""
+    __slots__ = ("message", "next_phase", "collected_data", "tool_outputs")
+    
     def __init__(
         self, 
         message: str, 
@@ -44,61 +166,104 @@ class EnhancedOrchestrator:
         self.llm = get_llm()
         self.validator = get_validator()
         self.data_extractor = get_data_extractor()
+        # Serialized conversation data of the latest snapshot we saw, per conversation:
+        # conversation_id -> (snapshot_id, JSON). Entries are validated against the
+        # latest snapshot id in the database before use, so another worker writing
+        # a newer snapshot just causes a miss. The JSON is parsed on every hit, so
+        # callers mutating nested values never touch the cached copy.
+        self._snapshot_data_cache: "OrderedDict[str, Tuple[Any, str | bytes]]" = OrderedDict()
+        self._snapshot_data_cache_lock = threading.Lock()
+        # Handlers for the structured phases, looked up by the conversation's phase
+        self._phase_handlers = {
+            ConversationPhase.DATA_COLLECTION: self._handle_data_collection_phase,
+            ConversationPhase.PROCESSING: self._handle_processing_phase,
+            ConversationPhase.REFINEMENT: self._handle_refinement_phase,
+            ConversationPhase.COMPLETED: self._handle_completed_phase,
+        }
+        # (execute tools, format results) per service intent
+        self._service_handlers = {
+            ConversationIntent.PACKING_LIST: (
+                self._execute_packing_tools, self._format_packing_results
+            ),
+            ConversationIntent.DESTINATION_RECOMMENDATION: (
+                self._execute_destination_tools, self._format_destination_results
+            ),
+            ConversationIntent.ATTRACTIONS: (
+                self._execute_attractions_tools, self._format_attractions_results
+            ),
+        }
     
     def process_user_message(
         self, 
         conversation_id: str,
         user_message: str,
-        db: Session
+        db: Session,
+        commit: bool = True
     ) -> AgentResponse:
         """
         Process a user message through structured conversation phases.
+        
+        Pass commit=False when the caller owns the transaction; the changes are
+        then only flushed and land in the caller's commit.
         """
         try:
-            # Load conversation and current data
-            conversation = db.query(Conversation).filter(
-                Conversation.id == conversation_id
-            ).first()
-            
-            if not conversation:
-                return AgentResponse("Sorry, I couldn't find that conversation.")
-            
-            # Check for intent changes first (before validation)
-            detected_intent = ConversationStateManager.detect_intent_from_message(user_message)
-            current_intent = conversation.current_intent
-            
-            # Handle intent transitions (but be more conservative)
-            if (detected_intent != current_intent and 
-                detected_intent != ConversationIntent.GENERAL and
-                self._should_allow_intent_transition(conversation, user_message, detected_intent)):
-                return self._handle_intent_transition(
-                    conversation, user_message, detected_intent, db
-                )
-            
-            # Validate user input for current intent
-            validation_result = self.validator.validate_user_message(
-                user_message, 
-                conversation.current_intent
-            )
-            
-            if not validation_result.is_valid:
-                return AgentResponse(validation_result.message)
-            
-            # Load existing conversation data
-            existing_data = self._load_conversation_data(conversation, db)
-            
-            # Process based on current state
-            if conversation.current_intent == ConversationIntent.GENERAL:
-                return self._handle_intent_detection(conversation, user_message, db)
+            response = self._route_user_message(conversation_id, user_message, db)
+            # Handlers only stage their changes; the whole turn lands in one commit
+            if commit:
+                db.commit()
             else:
-                return self._handle_structured_phases(
-                    conversation, user_message, existing_data, db
-                )
+                db.flush()
+            return response
                 
         except Exception as e:
-            logger.error(f"Error in enhanced orchestrator: {e}", exc_info=True)
+            logger.error("Error in enhanced orchestrator: %s", e, exc_info=True)
+            db.rollback()
             return AgentResponse(f"I encountered an error processing your request: {str(e)}. Please try again.")
     
+    def _route_user_message(
+        self,
+        conversation_id: str,
+        user_message: str,
+        db: Session
+    ) -> AgentResponse:
+        """Dispatch a message to the transition, intent detection or phase handlers."""
+        # Load conversation and current data
+        conversation = db.get(Conversation, conversation_id)
+        
+        if not conversation:
+            return AgentResponse("Sorry, I couldn't find that conversation.")
+        
+        # Check for intent changes first (before validation)
+        detected_intent = ConversationStateManager.detect_intent_from_message(user_message)
+        current_intent = conversation.current_intent
+        
+        # Handle intent transitions (but be more conservative)
+        if (detected_intent != current_intent and 
+            detected_intent != ConversationIntent.GENERAL and
+            self._should_allow_intent_transition(conversation, user_message, detected_intent)):
+            return self._handle_intent_transition(
+                conversation, user_message, detected_intent, db
+            )
+        
+        # Validate user input for current intent
+        validation_result = self.validator.validate_user_message(
+            user_message, 
+            conversation.current_intent
+        )
+        
+        if not validation_result.is_valid:
+            return AgentResponse(validation_result.message)
+        
+        # Process based on current state
+        if conversation.current_intent == ConversationIntent.GENERAL:
+            return self._handle_intent_detection(conversation, detected_intent, db)
+        else:
+            # Only structured phases work with the collected data
+            existing_data = self._load_conversation_data(conversation, db)
+            return self._handle_structured_phases(
+                conversation, user_message, existing_data, db
+            )
+    
     def resume_conversation(
         self,
         conversation_id: str,
@@ -109,29 +274,19 @@ class EnhancedOrchestrator:
         Returns conversation context for continued processing.
         """
         try:
-            # Load conversation
-            conversation = db.query(Conversation).filter(
-                Conversation.id == conversation_id
-            ).first()
+            # Load conversation, latest snapshot and turn count in one round-trip
+            resume_state = self._load_resume_state(conversation_id, db)
             
-            if not conversation:
+            if not resume_state:
                 return {"error": "Conversation not found"}
             
+            conversation, latest_snapshot, turn_count = resume_state
+            
             if conversation.status != ConversationStatus.ACTIVE:
                 return {"error": f"Conversation is {conversation.status.value}, cannot resume"}
             
-            # Load conversation data
-            existing_data = self._load_conversation_data(conversation, db)
-            
-            # Get latest state snapshot for synopsis
-            latest_snapshot = db.query(StateSnapshot).filter(
-                StateSnapshot.conversation_id == conversation.id
-            ).order_by(StateSnapshot.created_at.desc()).first()
-            
-            # Get turn count
-            turn_count = db.query(Turn).filter(
-                Turn.conversation_id == conversation_id
-            ).count()
+            # Load conversation data from the snapshot fetched above
+            existing_data = self._load_conversation_data(conversation, db, latest_snapshot)
             
             # Generate resume context
             resume_context = {
@@ -148,14 +303,47 @@ class EnhancedOrchestrator:
             resume_message = self._generate_resume_message(conversation, existing_data, turn_count)
             resume_context["resume_message"] = resume_message
             
-            logger.info(f"Successfully resumed conversation {conversation_id} at {conversation.current_phase}")
+            logger.info("Successfully resumed conversation %s at %s", conversation_id, conversation.current_phase)
             
             return resume_context
             
         except Exception as e:
-            logger.error(f"Error resuming conversation {conversation_id}: {e}")
+            logger.error("Error resuming conversation %s: %s", conversation_id, e)
             return {"error": f"Failed to resume conversation: {str(e)}"}
     
+    def _load_resume_state(self, conversation_id: str, db: Session):
+        """
+        Fetch a conversation with its latest state snapshot and turn count.
+        Returns (conversation, latest_snapshot, turn_count), or None if not found.
+        """
+        latest_snapshot_id = (
+            db.query(StateSnapshot.id)
+            .filter(StateSnapshot.conversation_id == Conversation.id)
+            .order_by(StateSnapshot.created_at.desc())
+            .limit(1)
+            .correlate(Conversation)
+            .scalar_subquery()
+        )
+        turn_count = (
+            db.query(func.count(Turn.id))
+            .filter(Turn.conversation_id == Conversation.id)
+            .correlate(Conversation)
+            .scalar_subquery()
+        )
+        
+        row = (
+            db.query(Conversation, StateSnapshot, turn_count)
+            .outerjoin(StateSnapshot, StateSnapshot.id == latest_snapshot_id)
+            .filter(Conversation.id == conversation_id)
+            .first()
+        )
+        
+        if not row:
+            return None
+        
+        conversation, latest_snapshot, count = row
+        return conversation, latest_snapshot, count or 0
+    
     def _generate_resume_message(
         self,
         conversation: Conversation,
@@ -164,20 +352,23 @@ class EnhancedOrchestrator:
     ) -> str:
         """Generate an appropriate message for resuming a conversation."""
         
-        intent_name = conversation.current_intent.value.replace('_', ' ').title()
+        intent_name = _DISPLAY_NAME_LC[conversation.current_intent]
         phase_name = conversation.current_phase.value.replace('_', ' ')
         
+        date_range = data.get("date_range") or _EMPTY
+        travelers = data.get("travelers") or _EMPTY
+        
         # Build context reminder
         context_parts = []
         if data.get("destination"):
             context_parts.append(f"destination: {data['destination']}")
-        if data.get("date_range", {}).get("duration_days"):
-            context_parts.append(f"duration: {data['date_range']['duration_days']} days")
-        if data.get("travelers"):
-            travelers = data["travelers"]
-            context_parts.append(f"travelers: {travelers.get('adults', 1)} adults")
+        if date_range.get("duration_days"):
+            context_parts.append(f"duration: {date_range['duration_days']} days")
+        if travelers:
             if travelers.get("kids", 0) > 0:
-                context_parts[-1] += f", {travelers['kids']} kids"
+                context_parts.append(f"travelers: {travelers.get('adults', 1)} adults, {travelers['kids']} kids")
+            else:
+                context_parts.append(f"travelers: {travelers.get('adults', 1)} adults")
         
         context_str = ", ".join(context_parts) if context_parts else "your request"
         
@@ -189,41 +380,82 @@ class EnhancedOrchestrator:
                 questions = self._generate_targeted_questions(
                     conversation.current_intent, missing_slots, max_questions=2
                 )
-                return (f"Welcome back! I'm helping you with {intent_name.lower()} "
+                return (f"Welcome back! I'm helping you with {intent_name} "
                        f"for {context_str}. I still need:\n" + 
                        "\n".join([f"• {q}" for q in questions]))
             else:
-                return (f"Welcome back! I have all the information for your {intent_name.lower()} "
+                return (f"Welcome back! I have all the information for your {intent_name} "
                        f"({context_str}). Ready to proceed with recommendations?")
                        
         elif conversation.current_phase == ConversationPhase.PROCESSING:
-            return (f"Welcome back! I was processing your {intent_name.lower()} request "
+            return (f"Welcome back! I was processing your {intent_name} request "
                    f"for {context_str}. Let me continue generating recommendations...")
                    
         elif conversation.current_phase == ConversationPhase.REFINEMENT:
-            return (f"Welcome back! I've prepared {intent_name.lower()} recommendations "
+            return (f"Welcome back! I've prepared {intent_name} recommendations "
                    f"for {context_str}. Would you like to review them or make any changes?")
                    
         elif conversation.current_phase == ConversationPhase.COMPLETED:
-            return (f"Welcome back! Your {intent_name.lower()} for {context_str} was "
+            return (f"Welcome back! Your {intent_name} for {context_str} was "
                    f"completed. Would you like to start a new request?")
         else:
-            return f"Welcome back! I'm ready to continue helping you with {intent_name.lower()}."
+            return f"Welcome back! I'm ready to continue helping you with {intent_name}."
     
-    def _load_conversation_data(self, conversation: Conversation, db: Session) -> Dict[str, Any]:
-        """Load existing conversation data from state snapshots."""
-        latest_snapshot = db.query(StateSnapshot).filter(
-            StateSnapshot.conversation_id == conversation.id
-        ).order_by(StateSnapshot.created_at.desc()).first()
+    def _load_conversation_data(
+        self,
+        conversation: Conversation,
+        db: Session,
+        latest_snapshot: Any = _NOT_LOADED
+    ) -> Dict[str, Any]:
+        """
+        Load existing conversation data from state snapshots.
+        Callers that already fetched the latest snapshot (or know there is none)
+        can pass it in to skip the query.
+        """
+        if latest_snapshot is _NOT_LOADED:
+            # Look up only the id first; the snapshot body is fetched on a cache miss
+            latest_snapshot_id = db.query(StateSnapshot.id).filter(
+                StateSnapshot.conversation_id == conversation.id
+            ).order_by(StateSnapshot.created_at.desc()).limit(1).scalar()
+            
+            if latest_snapshot_id is None:
+                return {}
+            
+            cached_data = self._get_cached_snapshot_data(conversation.id, latest_snapshot_id)
+            if cached_data is not None:
+                return cached_data
+            
+            latest_snapshot = db.get(StateSnapshot, latest_snapshot_id)
         
         if latest_snapshot:
             try:
-                return json.loads(latest_snapshot.conversation_data)
-            except (json.JSONDecodeError, TypeError):
-                logger.warning(f"Failed to parse conversation data for {conversation.id}")
+                data = orjson.loads(latest_snapshot.conversation_data)
+                self._cache_snapshot_data(
+                    conversation.id, latest_snapshot.id, latest_snapshot.conversation_data
+                )
+                return data
+            except (orjson.JSONDecodeError, TypeError):
+                logger.warning("Failed to parse conversation data for %s", conversation.id)
         
         return {}
     
+    def _get_cached_snapshot_data(self, conversation_id: str, snapshot_id: Any):
+        """Return a fresh copy of the cached data for this snapshot, or None on a miss."""
+        with self._snapshot_data_cache_lock:
+            entry = self._snapshot_data_cache.get(conversation_id)
+            if not entry or entry[0] != snapshot_id:
+                return None
+            self._snapshot_data_cache.move_to_end(conversation_id)
+        return orjson.loads(entry[1])
+    
+    def _cache_snapshot_data(self, conversation_id: str, snapshot_id: Any, data_json: str | bytes):
+        """Remember the serialized data of a conversation's latest snapshot."""
+        with self._snapshot_data_cache_lock:
+            self._snapshot_data_cache[conversation_id] = (snapshot_id, data_json)
+            self._snapshot_data_cache.move_to_end(conversation_id)
+            if len(self._snapshot_data_cache) > SNAPSHOT_DATA_CACHE_SIZE:
+                self._snapshot_data_cache.popitem(last=False)
+    
     def _save_conversation_data(
         self, 
         conversation: Conversation, 
@@ -235,34 +467,44 @@ class EnhancedOrchestrator:
     ):
         """Save conversation data to state snapshot with enhanced tracking."""
         try:
+            # Serialize once with sorted keys so the same bytes feed both the
+            # stored snapshot and the fingerprint
+            data_json = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+            
             # Generate prompt fingerprint if not provided
             if not prompt_fingerprint:
-                import hashlib
-                data_str = json.dumps(data, sort_keys=True)
-                prompt_fingerprint = hashlib.md5(data_str.encode()).hexdigest()[:16]
+                prompt_fingerprint = hashlib.blake2b(data_json, digest_size=8).hexdigest()
             
             # Create snapshot with enhanced data
             snapshot = StateSnapshot(
                 conversation_id=conversation.id,
                 intent=conversation.current_intent,
                 phase=conversation.current_phase,
-                collected_slots=json.dumps(collected_slots),
-                conversation_data=json.dumps(data),
-                pending_questions=json.dumps([]),
+                collected_slots=orjson.dumps(collected_slots).decode(),
+                conversation_data=data_json.decode(),
+                pending_questions=_NO_PENDING_QUESTIONS,
                 context_synopsis=self._generate_context_synopsis(conversation, data, db),
-                internal_scratchpad=json.dumps({
+                internal_scratchpad=orjson.dumps({
                     "last_prompt_fingerprint": prompt_fingerprint,
                     "tool_results_count": len(tool_results or []),
                     "data_completeness": len(collected_slots)
-                })
+                }).decode()
             )
+            # The INSERT joins the open transaction and is committed together with
+            # the rest of the turn (phase change, turn record) in one commit
             db.add(snapshot)
-            db.commit()
+            db.flush()
             
-            logger.info(f"Saved state snapshot for {conversation.id} with {len(collected_slots)} slots")
+            # Write through once the transaction commits, so the next turn can
+            # skip re-reading this snapshot
+            db.info.setdefault(_PENDING_CACHE_UPDATES, []).append(
+                partial(self._cache_snapshot_data, conversation.id, snapshot.id, data_json)
+            )
+            
+            logger.info("Saved state snapshot for %s with %s slots", conversation.id, len(collected_slots))
             
         except Exception as e:
-            logger.error(f"Failed to save conversation data: {e}")
+            logger.error("Failed to save conversation data: %s", e)
     
     def _generate_context_synopsis(
         self, 
@@ -272,27 +514,29 @@ class EnhancedOrchestrator:
     ) -> str:
         """Generate a compact context synopsis for the conversation."""
         
-        # Get conversation turns
-        turns = db.query(Turn).filter(
+        # Only need to know whether any turn exists yet
+        has_turns = db.query(Turn.id).filter(
             Turn.conversation_id == conversation.id
-        ).order_by(Turn.turn_number).all()
+        ).limit(1).scalar() is not None
         
-        if not turns:
-            return f"New {conversation.current_intent.value.replace('_', ' ')} conversation"
+        if not has_turns:
+            return f"New {_DISPLAY_NAME_LC[conversation.current_intent]} conversation"
         
         # Build synopsis
-        intent_name = conversation.current_intent.value.replace('_', ' ').title()
+        intent_name = _DISPLAY_NAME[conversation.current_intent]
         synopsis_parts = [f"{intent_name} request:"]
         
+        date_range = data.get("date_range") or _EMPTY
+        travelers = data.get("travelers") or _EMPTY
+        
         # Add key data points
         if data.get("destination"):
             synopsis_parts.append(f"destination={data['destination']}")
             
-        if data.get("date_range", {}).get("duration_days"):
-            synopsis_parts.append(f"duration={data['date_range']['duration_days']}d")
+        if date_range.get("duration_days"):
+            synopsis_parts.append(f"duration={date_range['duration_days']}d")
             
-        if data.get("travelers"):
-            travelers = data["travelers"]
+        if travelers:
             adults = travelers.get("adults", 0)
             kids = travelers.get("kids", 0)
             if kids > 0:
@@ -317,30 +561,16 @@ class EnhancedOrchestrator:
     def _handle_intent_detection(
         self, 
         conversation: Conversation, 
-        user_message: str,
+        intent: ConversationIntent,
         db: Session
     ) -> AgentResponse:
-        """Handle intent detection phase (unchanged from before)."""
-        intent = ConversationStateManager.detect_intent_from_message(user_message)
-        
+        """Handle intent detection phase, given the intent detected for this message."""
         if intent != ConversationIntent.GENERAL:
             # Update conversation
             conversation.current_intent = intent
             conversation.current_phase = ConversationPhase.DATA_COLLECTION
-            db.commit()
             
-            service_description = ConversationStateManager.get_service_description(intent)
-            questions = ConversationStateManager.get_prioritized_questions(
-                intent, [], max_questions=2
-            )
-            
-            if questions:
-                questions_text = "\n".join([f"• {q}" for q in questions])
-                response_message = f"Perfect! {service_description}\n\nTo get started:\n{questions_text}"
-            else:
-                response_message = f"Great! {service_description}"
-            
-            return AgentResponse(response_message, ConversationPhase.DATA_COLLECTION)
+            return AgentResponse(_INITIAL_PROMPT_BY_INTENT[intent], ConversationPhase.DATA_COLLECTION)
         
         else:
             return AgentResponse(
@@ -361,7 +591,7 @@ class EnhancedOrchestrator:
         """
         Handle intent transitions mid-conversation.
         """
-        logger.info(f"Intent transition detected: {conversation.current_intent} → {new_intent}")
+        logger.info("Intent transition detected: %s → %s", conversation.current_intent, new_intent)
         
         current_intent = conversation.current_intent
         current_phase = conversation.current_phase
@@ -408,7 +638,6 @@ class EnhancedOrchestrator:
         # Mark current service as completed if not already
         if conversation.current_phase != ConversationPhase.COMPLETED:
             conversation.current_phase = ConversationPhase.COMPLETED
-            db.commit()
             
             # Save completion state
             self._save_conversation_data(
@@ -422,7 +651,6 @@ class EnhancedOrchestrator:
         # Update conversation to new intent
         conversation.current_intent = new_intent
         conversation.current_phase = ConversationPhase.DATA_COLLECTION
-        db.commit()
         
         # Process the transition message with new intent
         extracted_data = self.data_extractor.extract_travel_data(
@@ -438,11 +666,10 @@ class EnhancedOrchestrator:
         if not missing_slots:
             # Have enough data, proceed to processing
             conversation.current_phase = ConversationPhase.PROCESSING
-            db.commit()
             
             return self._execute_tools_and_generate_response(
                 conversation, merged_data, db, 
-                f"Perfect! I'll now help you with {new_intent.value.replace('_', ' ')} based on your previous information."
+                f"Perfect! I'll now help you with {_DISPLAY_NAME_LC[new_intent]} based on your previous information."
             )
         else:
             # Need more data, ask questions
@@ -475,8 +702,8 @@ class EnhancedOrchestrator:
     ) -> AgentResponse:
         """Handle mid-conversation intent changes that need confirmation."""
         
-        current_service = conversation.current_intent.value.replace('_', ' ')
-        new_service = new_intent.value.replace('_', ' ')
+        current_service = _DISPLAY_NAME_LC[conversation.current_intent]
+        new_service = _DISPLAY_NAME_LC[new_intent]
         
         # For now, we'll automatically transition but inform the user
         # In a more sophisticated system, we might ask for confirmation first
@@ -493,7 +720,6 @@ class EnhancedOrchestrator:
         # Update conversation
         conversation.current_intent = new_intent
         conversation.current_phase = ConversationPhase.DATA_COLLECTION
-        db.commit()
         
         # Process the new message
         extracted_data = self.data_extractor.extract_travel_data(
@@ -507,7 +733,6 @@ class EnhancedOrchestrator:
         
         if not missing_slots:
             conversation.current_phase = ConversationPhase.PROCESSING
-            db.commit()
             
             return self._execute_tools_and_generate_response(
                 conversation, merged_data, db,
@@ -540,20 +765,12 @@ class EnhancedOrchestrator:
     ) -> Dict[str, Any]:
         """Extract data that can be shared between services."""
         
-        # Define which data fields can be shared between services
-        shareable_fields = {
-            "destination", "travelers", "date_range", "user_preferences", 
-            "budget_band", "climate_preference", "activities_planned",
-            "family_composition", "interests", "names", "ages", "budget_info",
-            "travel_style", "special_requirements", "packing_context"
-        }
-        
         shareable_data = {}
-        for field in shareable_fields:
+        for field in _SHAREABLE_FIELDS:
             if field in existing_data and existing_data[field]:
                 shareable_data[field] = existing_data[field]
         
-        logger.info(f"Sharing data from {from_intent} to {to_intent}: {list(shareable_data.keys())}")
+        logger.info("Sharing data from %s to %s: %s", from_intent, to_intent, list(shareable_data))
         return shareable_data
     
     def _should_allow_intent_transition(
@@ -564,34 +781,22 @@ class EnhancedOrchestrator:
     ) -> bool:
         """Determine if an intent transition should be allowed."""
         
+        message_lower = user_message.lower()
+        
         # Don't allow transition if user is just responding with simple confirmations
-        simple_responses = ["yes", "ok", "sure", "please", "go ahead", "continue", "proceed"]
-        if user_message.lower().strip() in simple_responses:
+        if message_lower.strip() in _SIMPLE_CONFIRMATIONS:
             return False
         
         # Don't allow transition if user is just asking for current service to proceed
-        current_service_continuations = {
-            ConversationIntent.PACKING_LIST: ["generate", "create", "make", "show me", "give me"],
-            ConversationIntent.DESTINATION_RECOMMENDATION: ["recommend", "suggest", "find"],
-            ConversationIntent.ATTRACTIONS: ["show", "tell me", "list"]
-        }
-        
-        current_continuations = current_service_continuations.get(conversation.current_intent, [])
-        if any(word in user_message.lower() for word in current_continuations):
+        current_continuations = _SERVICE_CONTINUATIONS.get(conversation.current_intent, ())
+        if any(word in message_lower for word in current_continuations):
             # Check if it's clearly about a different service
-            service_names = {
-                ConversationIntent.ATTRACTIONS: ["attractions", "activities", "things to do", "museums"],
-                ConversationIntent.PACKING_LIST: ["packing", "pack", "luggage"],
-                ConversationIntent.DESTINATION_RECOMMENDATION: ["destination", "place", "where"]
-            }
-            
-            target_service_words = service_names.get(detected_intent, [])
-            if not any(word in user_message.lower() for word in target_service_words):
+            target_service_words = _SERVICE_KEYWORDS.get(detected_intent, ())
+            if not any(word in message_lower for word in target_service_words):
                 return False
         
         # Allow transition if it's clearly a new request
-        transition_indicators = ["now", "also", "but", "however", "actually", "instead", "i would love"]
-        has_transition_indicator = any(indicator in user_message.lower() for indicator in transition_indicators)
+        has_transition_indicator = any(indicator in message_lower for indicator in _TRANSITION_INDICATORS)
         
         # Allow if there's a clear transition indicator or if it's after completion/refinement phase
         return (has_transition_indicator or 
@@ -613,18 +818,14 @@ class EnhancedOrchestrator:
         
         try:
             # Execute appropriate tools based on intent
-            if intent == ConversationIntent.PACKING_LIST:
-                tool_results = self._execute_packing_tools(data, reasoning_engine)
-                response_message = self._format_packing_results(tool_results, data)
-            elif intent == ConversationIntent.DESTINATION_RECOMMENDATION:
-                tool_results = self._execute_destination_tools(data, reasoning_engine)
-                response_message = self._format_destination_results(tool_results, data)
-            elif intent == ConversationIntent.ATTRACTIONS:
-                tool_results = self._execute_attractions_tools(data, reasoning_engine)
-                response_message = self._format_attractions_results(tool_results, data)
-            else:
+            service = self._service_handlers.get(intent)
+            if service is None:
                 return AgentResponse("I'm not sure how to help with that yet.")
             
+            execute_tools, format_results = service
+            tool_results = execute_tools(data, reasoning_engine)
+            response_message = format_results(tool_results, data)
+            
             # Add intro message if provided
             if intro_message:
                 response_message = f"{intro_message}\n\n{response_message}"
@@ -643,9 +844,9 @@ class EnhancedOrchestrator:
             )
             
         except Exception as e:
-            logger.error(f"Error executing tools for {intent}: {e}")
+            logger.error("Error executing tools for %s: %s", intent, e)
             return AgentResponse(
-                f"I encountered an issue generating your {intent.value.replace('_', ' ')}. "
+                f"I encountered an issue generating your {_DISPLAY_NAME_LC[intent]}. "
                 f"Let me try again or you can provide more specific information.",
                 ConversationPhase.DATA_COLLECTION
             )
@@ -659,31 +860,15 @@ class EnhancedOrchestrator:
     ) -> AgentResponse:
         """Handle the structured conversation phases."""
         
-        current_phase = conversation.current_phase
-        intent = conversation.current_intent
+        handler = self._phase_handlers.get(conversation.current_phase)
+        if handler:
+            return handler(conversation, user_message, existing_data, db)
         
-        if current_phase == ConversationPhase.DATA_COLLECTION:
-            return self._handle_data_collection_phase(
-                conversation, user_message, existing_data, db
-            )
-        elif current_phase == ConversationPhase.PROCESSING:
-            return self._handle_processing_phase(
-                conversation, user_message, existing_data, db
-            )
-        elif current_phase == ConversationPhase.REFINEMENT:
-            return self._handle_refinement_phase(
-                conversation, user_message, existing_data, db
-            )
-        elif current_phase == ConversationPhase.COMPLETED:
-            return self._handle_completed_phase(
-                conversation, user_message, existing_data, db
-            )
-        else:
-            # Default fallback
-            return AgentResponse(
-                f"I'm currently helping you with {intent.value.replace('_', ' ')}. "
-                f"What specific information do you need?"
-            )
+        # Default fallback
+        return AgentResponse(
+            f"I'm currently helping you with {_DISPLAY_NAME_LC[conversation.current_intent]}. "
+            f"What specific information do you need?"
+        )
     
     def _handle_data_collection_phase(
         self,
@@ -714,11 +899,10 @@ class EnhancedOrchestrator:
         if not missing_slots:
             # We have enough data to proceed to processing
             conversation.current_phase = ConversationPhase.PROCESSING
-            db.commit()
             
-            service_name = conversation.current_intent.value.replace("_", " ").title()
+            service_name = _DISPLAY_NAME_LC[conversation.current_intent]
             return AgentResponse(
-                f"Perfect! I have all the information I need for your {service_name.lower()}. "
+                f"Perfect! I have all the information I need for your {service_name}. "
                 f"Let me process this and provide recommendations...",
                 ConversationPhase.PROCESSING,
                 collected_data=new_data
@@ -751,25 +935,8 @@ class EnhancedOrchestrator:
     ) -> List[str]:
         """Generate targeted questions for missing slots."""
         
-        question_map = {
-            ConversationIntent.PACKING_LIST: {
-                "destination": "What's your destination?",
-                "date_range": "When are you traveling? (dates or duration)",
-                "travelers": "How many people are traveling and what are their ages?",
-            },
-            ConversationIntent.DESTINATION_RECOMMENDATION: {
-                "interests": "What type of activities or experiences are you looking for?",
-                "date_range": "When are you planning to travel?",
-                "travelers": "How many people will be traveling?",
-            },
-            ConversationIntent.ATTRACTIONS: {
-                "destination": "Which city would you like attraction suggestions for?",
-                "visit_duration": "How many days will you be visiting?",
-            }
-        }
-        
         questions = []
-        service_questions = question_map.get(intent, {})
+        service_questions = _TARGETED_QUESTIONS.get(intent, {})
         
         for slot in missing_slots[:max_questions]:
             if slot in service_questions:
@@ -795,21 +962,17 @@ class EnhancedOrchestrator:
         if scratchpad is None:
             logger.warning("No scratchpad created for processing phase")
             conversation.current_phase = ConversationPhase.REFINEMENT
-            db.commit()
             return AgentResponse("I'm processing your request...", ConversationPhase.REFINEMENT)
         
-        logger.info(f"Starting tool execution for {conversation.current_intent.value}")
+        logger.info("Starting tool execution for %s", conversation.current_intent.value)
         
         # Execute tools based on intent
         tool_results = []
         
         try:
-            if conversation.current_intent == ConversationIntent.PACKING_LIST:
-                tool_results = self._execute_packing_tools(existing_data, scratchpad)
-            elif conversation.current_intent == ConversationIntent.DESTINATION_RECOMMENDATION:
-                tool_results = self._execute_destination_tools(existing_data, scratchpad)
-            elif conversation.current_intent == ConversationIntent.ATTRACTIONS:
-                tool_results = self._execute_attractions_tools(existing_data, scratchpad)
+            service = self._service_handlers.get(conversation.current_intent)
+            if service is not None:
+                tool_results = service[0](existing_data, scratchpad)
             
             # Record completed tool calls
             scratchpad.completed_tool_calls = tool_results
@@ -824,7 +987,6 @@ class EnhancedOrchestrator:
             
             # Move to refinement
             conversation.current_phase = ConversationPhase.REFINEMENT
-            db.commit()
             
             return AgentResponse(
                 response_message,
@@ -834,15 +996,14 @@ class EnhancedOrchestrator:
             )
             
         except Exception as e:
-            logger.error(f"Tool execution error: {e}", exc_info=True)
+            logger.error("Tool execution error: %s", e, exc_info=True)
             
             # Fallback response on tool failure
-            service_name = conversation.current_intent.value.replace("_", " ").title()
+            service_name = _DISPLAY_NAME_LC[conversation.current_intent]
             conversation.current_phase = ConversationPhase.REFINEMENT
-            db.commit()
             
             return AgentResponse(
-                f"I encountered an issue while generating your {service_name.lower()}: {str(e)}\n\n"
+                f"I encountered an issue while generating your {service_name}: {str(e)}\n\n"
                 f"Let me provide general recommendations based on your requirements.\n\n"
                 f"For your 5-day Tokyo trip, I recommend:\n"
                 f"• Comfortable walking shoes (temple visits)\n"
@@ -858,77 +1019,14 @@ class EnhancedOrchestrator:
         """Execute tools for packing list generation."""
         results = []
         
-        # Get weather data first
+        # Weather and city info are independent lookups, so run them concurrently
         weather_data = {}
         if data.get("destination"):
-            try:
-                weather_tool = get_weather_tool()
-                
-                # Calculate dates (fallback to near future if not specified)
-                date_range = data.get("date_range", {})
-                if date_range.get("start"):
-                    start_date = date_range["start"]
-                    if date_range.get("end"):
-                        end_date = date_range["end"]
-                    else:
-                        duration = date_range.get("duration_days", 7)
-                        start = datetime.fromisoformat(start_date).date()
-                        end_date = (start + timedelta(days=duration-1)).isoformat()
-                else:
-                    # Use near future dates
-                    start = date.today() + timedelta(days=7)
-                    duration = date_range.get("duration_days", 7)
-                    start_date = start.isoformat()
-                    end_date = (start + timedelta(days=duration-1)).isoformat()
-                
-                weather_result = weather_tool.execute(
-                    city=data["destination"],
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                
-                if weather_result.success:
-                    weather_data = weather_result.data
-                    results.append({
-                        "tool_name": "weather",
-                        "success": True,
-                        "data": weather_data,
-                        "cached": weather_result.cached
-                    })
-                else:
-                    results.append({
-                        "tool_name": "weather", 
-                        "success": False,
-                        "error": weather_result.error
-                    })
-                    # Use fallback weather data
-                    weather_data = {
-                        "avg_high": 20, "avg_low": 10, 
-                        "max_precip_prob": 30, "summary": "Moderate conditions expected"
-                    }
-                    
-            except Exception as e:
-                logger.error(f"Weather tool error: {e}")
-                results.append({"tool_name": "weather", "success": False, "error": str(e)})
-                weather_data = {"avg_high": 20, "avg_low": 10, "max_precip_prob": 30}
-        
-        # Get city info
-        if data.get("destination"):
-            try:
-                city_tool = get_city_info_tool()
-                city_result = city_tool.execute(city=data["destination"])
-                
-                results.append({
-                    "tool_name": "city_info",
-                    "success": city_result.success,
-                    "data": city_result.data if city_result.success else None,
-                    "error": city_result.error if not city_result.success else None,
-                    "cached": city_result.cached if city_result.success else False
-                })
-                
-            except Exception as e:
-                logger.error(f"City info tool error: {e}")
-                results.append({"tool_name": "city_info", "success": False, "error": str(e)})
+            city_future = _TOOL_EXECUTOR.submit(self._run_city_info_tool, data, True)
+            weather_entry, weather_data = self._run_weather_tool(data)
+            
+            results.append(weather_entry)
+            results.append(city_future.result())
         
         # Generate packing list
         try:
@@ -959,11 +1057,87 @@ class EnhancedOrchestrator:
             })
             
         except Exception as e:
-            logger.error(f"Packing tool error: {e}")
+            logger.error("Packing tool error: %s", e)
             results.append({"tool_name": "packing", "success": False, "error": str(e)})
         
         # IMPORTANT: Return the results list
         return results
+    
+    def _run_weather_tool(self, data: Dict[str, Any]):
+        """
+        Fetch the forecast for the trip destination.
+        Returns (result entry, weather data), falling back to moderate conditions on failure.
+        """
+        try:
+            weather_tool = get_weather_tool()
+            
+            # Calculate dates (fallback to near future if not specified)
+            date_range = data.get("date_range", {})
+            if date_range.get("start"):
+                start_date = date_range["start"]
+                if date_range.get("end"):
+                    end_date = date_range["end"]
+                else:
+                    duration = date_range.get("duration_days", 7)
+                    start = datetime.fromisoformat(start_date).date()
+                    end_date = (start + timedelta(days=duration-1)).isoformat()
+            else:
+                # Use near future dates
+                start = date.today() + timedelta(days=7)
+                duration = date_range.get("duration_days", 7)
+                start_date = start.isoformat()
+                end_date = (start + timedelta(days=duration-1)).isoformat()
+            
+            weather_result = weather_tool.execute(
+                city=data["destination"],
+                start_date=start_date,
+                end_date=end_date
+            )
+            
+            if weather_result.success:
+                return {
+                    "tool_name": "weather",
+                    "success": True,
+                    "data": weather_result.data,
+                    "cached": weather_result.cached
+                }, weather_result.data
+            
+            # Use fallback weather data
+            return {
+                "tool_name": "weather", 
+                "success": False,
+                "error": weather_result.error
+            }, {
+                "avg_high": 20, "avg_low": 10, 
+                "max_precip_prob": 30, "summary": "Moderate conditions expected"
+            }
+                
+        except Exception as e:
+            logger.error("Weather tool error: %s", e)
+            return (
+                {"tool_name": "weather", "success": False, "error": str(e)},
+                {"avg_high": 20, "avg_low": 10, "max_precip_prob": 30}
+            )
+    
+    def _run_city_info_tool(self, data: Dict[str, Any], include_cached: bool = False) -> Dict[str, Any]:
+        """Fetch city information for the trip destination as a result entry."""
+        try:
+            city_tool = get_city_info_tool()
+            city_result = city_tool.execute(city=data["destination"])
+            
+            entry = {
+                "tool_name": "city_info",
+                "success": city_result.success,
+                "data": city_result.data if city_result.success else None,
+                "error": city_result.error if not city_result.success else None
+            }
+            if include_cached:
+                entry["cached"] = city_result.cached if city_result.success else False
+            return entry
+            
+        except Exception as e:
+            logger.error("City info tool error: %s", e)
+            return {"tool_name": "city_info", "success": False, "error": str(e)}
         
     def _format_tool_results(
         self,
@@ -974,14 +1148,10 @@ class EnhancedOrchestrator:
     ) -> str:
         """Format tool results into user-friendly response."""
         
-        if intent == ConversationIntent.PACKING_LIST:
-            return self._format_packing_results(tool_results, user_data)
-        elif intent == ConversationIntent.ATTRACTIONS:
-            return self._format_attractions_results(tool_results, user_data)
-        elif intent == ConversationIntent.DESTINATION_RECOMMENDATION:
-            return self._format_destination_results(tool_results, user_data)
-        else:
+        service = self._service_handlers.get(intent)
+        if service is None:
             return "I've processed your request with the available tools."
+        return service[1](tool_results, user_data)
     
     def _format_packing_results(self, tool_results: List[Dict[str, Any]], user_data: Dict[str, Any]) -> str:
         """Format packing list results."""
@@ -1329,7 +1499,7 @@ class EnhancedOrchestrator:
             })
             
         except Exception as e:
-            logger.error(f"Destination tool error: {e}")
+            logger.error("Destination tool error: %s", e)
             results.append({
                 "tool_name": "destination_recommendation", 
                 "success": False,
@@ -1342,23 +1512,21 @@ class EnhancedOrchestrator:
         """Execute tools for attraction suggestions."""
         results = []
         
-        # Get city info for attractions context
+        # City info and attraction suggestions don't depend on each other,
+        # so fetch the city context while the attractions are generated
+        city_future = None
         if data.get("destination"):
-            try:
-                city_tool = get_city_info_tool()
-                city_result = city_tool.execute(city=data["destination"])
-                
-                results.append({
-                    "tool_name": "city_info",
-                    "success": city_result.success,
-                    "data": city_result.data if city_result.success else None,
-                    "error": city_result.error if not city_result.success else None
-                })
-                
-            except Exception as e:
-                results.append({"tool_name": "city_info", "success": False, "error": str(e)})
+            city_future = _TOOL_EXECUTOR.submit(self._run_city_info_tool, data)
+        attractions_entry = self._run_attractions_tool(data)
+        
+        if city_future:
+            results.append(city_future.result())
+        results.append(attractions_entry)
         
-        # Get attraction recommendations
+        return results
+    
+    def _run_attractions_tool(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Get attraction recommendations for the trip as a result entry."""
         try:
             from app.tools import get_attractions_tool
             attractions_tool = get_attractions_tool()
@@ -1386,23 +1554,21 @@ class EnhancedOrchestrator:
             
             attractions_result = attractions_tool.execute(**attractions_params)
             
-            results.append({
+            return {
                 "tool_name": "attractions_finder",
                 "success": attractions_result.success,
                 "data": attractions_result.data if attractions_result.success else None,
                 "error": attractions_result.error if not attractions_result.success else None,
                 "cached": attractions_result.cached
-            })
+            }
             
         except Exception as e:
-            logger.error(f"Attractions tool error: {e}")
-            results.append({
+            logger.error("Attractions tool error: %s", e)
+            return {
                 "tool_name": "attractions_finder",
                 "success": False,
                 "error": str(e)
-            })
-        
-        return results
+            }
     
     def _handle_refinement_phase(
         self,
@@ -1413,12 +1579,8 @@ class EnhancedOrchestrator:
     ) -> AgentResponse:
         """Handle REFINEMENT phase - allow modifications and pre-finalize checks."""
         
-        message_lower = user_message.lower()
-        
         # Check for completion signals
-        if any(word in message_lower for word in [
-            "looks good", "perfect", "thanks", "that's great", "no changes", "finalize"
-        ]):
+        if _FINALIZE_SIGNALS.search(user_message):
             # Before finalizing, run quality checks
             return self._run_pre_finalize_checks(conversation, existing_data, db)
         else:
@@ -1448,7 +1610,6 @@ class EnhancedOrchestrator:
         if scratchpad is None:
             # Skip checks for general intent
             conversation.current_phase = ConversationPhase.COMPLETED
-            db.commit()
             return AgentResponse(
                 "Great! Your request has been completed.",
                 ConversationPhase.COMPLETED
@@ -1496,15 +1657,18 @@ class EnhancedOrchestrator:
                 passed_checks.append(check)
         
         # Generate quality check summary
-        check_summary = f"**Pre-finalize quality checks completed:**\n"
-        check_summary += f"✅ {len(passed_checks)} checks passed\n"
+        summary_lines = [
+            "**Pre-finalize quality checks completed:**",
+            f"✅ {len(passed_checks)} checks passed"
+        ]
         
         if failed_checks:
-            check_summary += f"⚠️ {len(failed_checks)} checks need attention\n\n"
-            check_summary += "**Auto-adjustments made:**\n"
-            for fix in auto_fixes:
-                check_summary += f"• {fix}\n"
-            check_summary += "\n"
+            summary_lines.append(f"⚠️ {len(failed_checks)} checks need attention\n")
+            summary_lines.append("**Auto-adjustments made:**")
+            summary_lines.extend(f"• {fix}" for fix in auto_fixes)
+            summary_lines.append("")
+        
+        check_summary = "\n".join(summary_lines) + "\n"
         
         # Store quality check results in scratchpad
         scratchpad.quality_checks = quality_checks
@@ -1513,7 +1677,6 @@ class EnhancedOrchestrator:
         
         # Finalize
         conversation.current_phase = ConversationPhase.COMPLETED
-        db.commit()
         
         return AgentResponse(
             f"Excellent! I've completed your trip planning with quality assurance.\n\n"
@@ -1545,9 +1708,12 @@ class EnhancedOrchestrator:
 
 
 # Global orchestrator instance  
-_enhanced_orchestrator = EnhancedOrchestrator()
+_enhanced_orchestrator = None
 
 
 def get_orchestrator() -> EnhancedOrchestrator:
-    """Get the enhanced orchestrator instance."""
+    """Get the enhanced orchestrator instance, creating it on first use."""
+    global _enhanced_orchestrator
+    if _enhanced_orchestrator is None:
+        _enhanced_orchestrator = EnhancedOrchestrator()
     return _enhanced_orchestrator
\ No newline at end of file
@@ -2,6 +2,8 @@
 Simple validator for user input.
 """
 import logging
+import threading
+from functools import lru_cache
 from typing import Optional
 
 from app.core.exceptions import PolicyViolationError
@@ -14,12 +16,35 @@ logger = logging.getLogger(__name__)
 
 class ValidationResult:
     """Simple result of validation."""
+    __slots__ = ("is_valid", "message", "violation_type")
+    
     def __init__(self, is_valid: bool, message: str = "", violation_type: str = ""):
         self.is_valid = is_valid
         self.message = message
         self.violation_type = violation_type
 
 
+# Messages longer than this are checked without caching, to bound cache memory
+MAX_CACHED_MESSAGE_LENGTH = 512
+
+
+@lru_cache(maxsize=4096)
+def _check_message(message: str, current_intent: ConversationIntent) -> tuple[str, str]:
+    """
+    Run the safety and scope policies on a stripped, lowercased message.
+    Returns (violation_type, reason); violation_type is empty for valid messages.
+    """
+    is_safe, safety_reason = is_safe_content(message)
+    if not is_safe:
+        return "safety", safety_reason
+    
+    is_in_scope, scope_reason = is_travel_related(message, current_intent)
+    if not is_in_scope:
+        return "scope", scope_reason
+    
+    return "", ""
+
+
 class Validator:
     """Simple validator for user messages."""
     
@@ -32,10 +57,18 @@ class Validator:
         Validate a user message for safety and scope.
         """
         try:
+            # Lowercase once here; both policies match against lowercased text and
+            # ignore surrounding whitespace, so repeated messages ("hi", "thanks",
+            # retries) also share a cache entry
+            normalized = message.strip().lower()
+            if len(normalized) <= MAX_CACHED_MESSAGE_LENGTH:
+                violation_type, reason = _check_message(normalized, current_intent)
+            else:
+                violation_type, reason = _check_message.__wrapped__(normalized, current_intent)
+            
             # Safety check
-            is_safe, safety_reason = is_safe_content(message)
-            if not is_safe:
-                logger.warning(f"Safety violation: {safety_reason}")
+            if violation_type == "safety":
+                logger.warning("Safety violation: %s", reason)
                 return ValidationResult(
                     is_valid=False,
                     message=get_safety_refusal_message(),
@@ -43,9 +76,8 @@ class Validator:
                 )
             
             # Scope check
-            is_in_scope, scope_reason = is_travel_related(message, current_intent)
-            if not is_in_scope:
-                logger.info(f"Out of scope: {scope_reason}")
+            if violation_type == "scope":
+                logger.info("Out of scope: %s", reason)
                 return ValidationResult(
                     is_valid=False,
                     message=get_scope_redirect_message(),
@@ -56,7 +88,7 @@ class Validator:
             return ValidationResult(is_valid=True)
             
         except Exception as e:
-            logger.error(f"Validation error: {e}")
+            logger.error("Validation error: %s", e)
             return ValidationResult(
                 is_valid=False,
                 message="I encountered an error. Please try again.",
@@ -64,10 +96,17 @@ class Validator:
             )
 
 
-# Global validator instance
-_validator = Validator()
+# Global validator instance, created on first use like the tool singletons
+_validator: Optional[Validator] = None
+_validator_lock = threading.Lock()
 
 
 def get_validator() -> Validator:
-    """Get the validator instance."""
+    """Get the validator instance, creating it on first use."""
+    global _validator
+    if _validator is None:
+        # First calls can race on worker threads; build only one instance
+        with _validator_lock:
+            if _validator is None:
+                _validator = Validator()
     return _validator
\ No newline at end of file
@@ -1,10 +1,11 @@
 """
 Application configuration using Pydantic settings.
 """
+from functools import lru_cache
 from typing import List
 
 from pydantic import Field
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -22,6 +23,10 @@ class Settings(BaseSettings):
     # AI/LLM
     OLLAMA_BASE_URL: str = Field(default="http://localhost:11434", env="OLLAMA_BASE_URL")
     OLLAMA_MODEL: str = Field(default="llama3.1:8b", env="OLLAMA_MODEL")
+    # Optional smaller model tried first for short factual lookups (e.g. "llama3.2:3b")
+    OLLAMA_FAST_MODEL: str = Field(default="", env="OLLAMA_FAST_MODEL")
+    # Read timeout for LLM calls; a completion on CPU or a cold model load can take minutes
+    OLLAMA_TIMEOUT_SECONDS: int = Field(default=300, env="OLLAMA_TIMEOUT_SECONDS")
     # Backup cloud providers (optional)
     OPENAI_API_KEY: str = Field(default="", env="OPENAI_API_KEY")
     ANTHROPIC_API_KEY: str = Field(default="", env="ANTHROPIC_API_KEY")
@@ -56,10 +61,18 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
     LOG_FORMAT: str = Field(default="json", env="LOG_FORMAT")
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # Frozen so the single cached instance can be shared safely
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True)
 
 
-# Create settings instance
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings from the environment and .env on first use, then reuse them."""
+    return Settings()
+
+
+def __getattr__(name: str):
+    # Keep `from app.core.config import settings` working without loading at import
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
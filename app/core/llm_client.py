@@ -5,40 +5,59 @@ import logging
 from typing import Optional
 
 from langchain_ollama import OllamaLLM
-from app.core.config import settings
+from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 
+# Shared clients, created on first use so their HTTP connection pools are reused
+_llm: Optional[OllamaLLM] = None
+_json_llm: Optional[OllamaLLM] = None
+
+# Token cap for structured extraction; the expected JSON objects are short
+JSON_LLM_MAX_TOKENS = 128
+
+
 def get_llm() -> OllamaLLM:
-    """Get a configured Ollama LLM instance for conversations (temperature=0.7)."""
-    try:
-        llm = OllamaLLM(
-            base_url=settings.OLLAMA_BASE_URL,
-            model=settings.OLLAMA_MODEL,
-            temperature=0.7,
-        )
-        logger.info(f"Created conversational LLM with model {settings.OLLAMA_MODEL}")
-        return llm
-    except Exception as e:
-        logger.error(f"Failed to create conversational LLM: {e}")
-        raise
+    """Get the shared Ollama LLM instance for conversations (temperature=0.7)."""
+    global _llm
+    if _llm is None:
+        settings = get_settings()
+        try:
+            _llm = OllamaLLM(
+                base_url=settings.OLLAMA_BASE_URL,
+                model=settings.OLLAMA_MODEL,
+                temperature=0.7,
+            )
+            logger.info(f"Created conversational LLM with model {settings.OLLAMA_MODEL}")
+        except Exception as e:
+            logger.error(f"Failed to create conversational LLM: {e}")
+            raise
+    return _llm
 
 
-def get_factual_llm() -> OllamaLLM:
-    """Get a configured Ollama LLM instance for factual queries (temperature=0)."""
-    try:
-        llm = OllamaLLM(
-            base_url=settings.OLLAMA_BASE_URL,
-            model=settings.OLLAMA_MODEL,
-            temperature=0,  # Deterministic for factual data
-            top_p=1.0,      # No sampling randomness
-        )
-        logger.info(f"Created factual LLM with model {settings.OLLAMA_MODEL}")
-        return llm
-    except Exception as e:
-        logger.error(f"Failed to create factual LLM: {e}")
-        raise
+def get_json_llm() -> OllamaLLM:
+    """
+    Get the shared Ollama LLM instance for structured extraction.
+    Runs in Ollama's JSON mode so every response is a single parseable JSON object.
+    """
+    global _json_llm
+    if _json_llm is None:
+        settings = get_settings()
+        try:
+            _json_llm = OllamaLLM(
+                base_url=settings.OLLAMA_BASE_URL,
+                model=settings.OLLAMA_MODEL,
+                temperature=0,
+                top_p=1.0,
+                format="json",
+                num_predict=JSON_LLM_MAX_TOKENS,
+            )
+            logger.info(f"Created JSON LLM with model {settings.OLLAMA_MODEL}")
+        except Exception as e:
+            logger.error(f"Failed to create JSON LLM: {e}")
+            raise
+    return _json_llm
 
 
 def test_llm_connection() -> bool:
@@ -0,0 +1,108 @@
+"""
+Thin Ollama client for simple factual completions.
+Posts straight to /api/generate over a pooled HTTP connection, skipping
+the LangChain wrapper where its features are not needed.
+"""
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+# Shared client, created on first use so its keep-alive connections are reused
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    """Get the shared HTTP client for the Ollama server."""
+    global _client
+    if _client is None:
+        # Tool threads can race on the first call; only one client should be opened
+        with _client_lock:
+            if _client is None:
+                settings = get_settings()
+                _client = httpx.Client(
+                    base_url=settings.OLLAMA_BASE_URL,
+                    # Connecting should be quick, but a whole completion has to fit in the read timeout
+                    timeout=httpx.Timeout(
+                        settings.OLLAMA_TIMEOUT_SECONDS, connect=settings.TOOL_TIMEOUT_SECONDS
+                    ),
+                    limits=httpx.Limits(max_keepalive_connections=20),
+                )
+    return _client
+
+
+def _build_payload(
+    prompt: str,
+    stream: bool,
+    temperature: float,
+    num_predict: int,
+    format: Optional[str] = None,
+    system: Optional[str] = None,
+    model: Optional[str] = None
+) -> Dict[str, Any]:
+    payload = {
+        "model": model or get_settings().OLLAMA_MODEL,
+        "prompt": prompt,
+        "stream": stream,
+        "options": {
+            "temperature": temperature,
+            "top_p": 1.0,
+            "num_predict": num_predict,
+        },
+    }
+    if format:
+        payload["format"] = format
+    if system:
+        payload["system"] = system
+    return payload
+
+
+def generate(
+    prompt: str,
+    temperature: float = 0,
+    num_predict: int = 128,
+    format: Optional[str] = None,
+    model: Optional[str] = None
+) -> str:
+    """
+    Run a single non-streaming completion and return the generated text.
+    Uses OLLAMA_MODEL unless another model is given.
+    Raises httpx.HTTPError if Ollama is unreachable or returns an error.
+    """
+    payload = _build_payload(prompt, False, temperature, num_predict, format=format, model=model)
+
+    response = get_client().post("/api/generate", json=payload)
+    response.raise_for_status()
+    return response.json()["response"]
+
+
+def stream_generate(
+    prompt: str,
+    system: Optional[str] = None,
+    temperature: float = 0,
+    num_predict: int = 128
+) -> Iterator[str]:
+    """
+    Stream a completion, yielding text fragments as they arrive.
+    Closing the iterator early drops the connection, which stops generation
+    on the server. Raises httpx.HTTPError like generate().
+    """
+    payload = _build_payload(prompt, True, temperature, num_predict, system=system)
+
+    with get_client().stream("POST", "/api/generate", json=payload) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if chunk.get("response"):
+                yield chunk["response"]
+            if chunk.get("done"):
+                break
@@ -3,24 +3,25 @@ Simple safety validation.
 """
 import re
 
+# Very basic harmful patterns, compiled once into a single scan over lowercased text
+_HARMFUL_CONTENT_RE = re.compile(
+    r'\b(?:kill|murder|bomb|weapon|illegal|drug|smuggl(?:e|ing)?|traffic)\b'
+)
 
-def is_safe_content(text: str) -> tuple[bool, str]:
+
+def is_safe_content(text_lower: str) -> tuple[bool, str]:
     """
-    Check if content is safe.
+    Check if content is safe. Expects text that is already lowercased.
     Returns (is_safe, reason_if_unsafe)
     """
-    text_lower = text.lower()
-    
-    # Very basic harmful patterns
-    harmful_patterns = [
-        r'\b(kill|murder|bomb|weapon|illegal)\b',
-        r'\b(drug|smuggl|traffic)\b',
-        r'\b(smuggle|smuggling)\b',
-    ]
+    if not text_lower or text_lower.isspace():
+        return True, ""
     
-    for pattern in harmful_patterns:
-        if re.search(pattern, text_lower):
-            return False, f"Contains potentially harmful content"
+    # The whole message is scanned, however long: the pattern is a plain
+    # alternation (linear time), and truncating would let harmful text hide
+    # past the cut
+    if _HARMFUL_CONTENT_RE.search(text_lower):
+        return False, "Contains potentially harmful content"
     
     return True, ""
 
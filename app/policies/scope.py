@@ -1,43 +1,62 @@
 """
 Simple scope validation to keep conversations travel-related.
 """
+import re
+
 from app.schemas import ConversationIntent
 
 
-def is_travel_related(text: str, current_intent: ConversationIntent) -> tuple[bool, str]:
+# Tokenizer for keyword lookups; the policies receive lowercased text
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Travel keyword stems; a word counts when it starts with one, so inflections
+# like "travelers", "visited" or "vacationing" are covered
+_TRAVEL_STEMS = (
+    "travel", "trip", "vacation", "destination", "visit",
+    "pack", "backpack", "unpack", "repack",
+    "attraction", "activit", "hotel", "flight", "sightseeing", "luggage",
+)
+
+# Off-topic keywords (very basic for now)
+_OFF_TOPIC_KEYWORDS = frozenset({
+    "programming", "code", "coding", "medical", "legal", "homework",
+    "investment", "investments",
+})
+
+# Only the start of very long messages is scanned for keywords
+MAX_SCOPE_SCAN_LENGTH = 2048
+
+# Greetings allowed even in very short messages
+_GREETINGS = frozenset({"hi", "hello", "help", "thanks"})
+
+
+def is_travel_related(text_lower: str, current_intent: ConversationIntent) -> tuple[bool, str]:
     """
-    Check if message is travel-related.
+    Check if message is travel-related. Expects text that is already lowercased.
     Returns (is_travel_related, reason_if_not)
     """
-    text_lower = text.lower()
-    
     # If already in a travel conversation, be more lenient
     if current_intent != ConversationIntent.GENERAL:
         return True, ""
     
-    # Travel keywords
-    travel_keywords = [
-        "travel", "trip", "vacation", "destination", "visit", "pack", "packing",
-        "attractions", "activities", "hotel", "flight", "sightseeing", "luggage"
-    ]
-    
-    # Check if message contains travel keywords
-    has_travel_keywords = any(keyword in text_lower for keyword in travel_keywords)
+    if not text_lower or text_lower.isspace():
+        return False, "doesn't appear to be travel-related"
     
-    # Off-topic patterns (very basic for now)
-    off_topic_patterns = [
-        "programming", "code", "medical", "legal", "homework", "investment"
-    ]
+    text = text_lower[:MAX_SCOPE_SCAN_LENGTH]
+    # Tokenize once; keyword checks then run over the distinct words
+    words = set(_WORD_RE.findall(text))
     
-    has_off_topic = any(pattern in text_lower for pattern in off_topic_patterns)
+    # Messages with travel keywords are always in scope
+    if any(word.startswith(_TRAVEL_STEMS) for word in words):
+        return True, ""
     
-    if has_off_topic and not has_travel_keywords:
+    if not words.isdisjoint(_OFF_TOPIC_KEYWORDS):
         return False, "appears to be about non-travel topics"
     
     # Very short messages without travel keywords might be off-topic
-    if len(text.split()) < 3 and not has_travel_keywords:
+    if len(text.split(maxsplit=2)) < 3:
         # Allow greetings
-        if any(word in text_lower for word in ["hi", "hello", "help", "thanks"]):
+        if not words.isdisjoint(_GREETINGS):
             return True, ""
         return False, "doesn't appear to be travel-related"
     
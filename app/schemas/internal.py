@@ -1,13 +1,16 @@
 """
 Internal reasoning schemas for chain-of-thought processing.
 These are NEVER exposed to users - only used internally.
+Plain slotted dataclasses rather than Pydantic models: only internal code
+builds them, so there is nothing to validate.
 """
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from app.schemas import ConversationIntent
 
 
-class ToolCallPlan(BaseModel):
+@dataclass(slots=True)
+class ToolCallPlan:
     """Plan for a tool call."""
     tool_name: str
     reasoning: str
@@ -16,7 +19,8 @@ class ToolCallPlan(BaseModel):
     required: bool = True
 
 
-class QualityCheck(BaseModel):
+@dataclass(slots=True)
+class QualityCheck:
     """A quality check to perform."""
     check_name: str
     question: str
@@ -25,36 +29,129 @@ class QualityCheck(BaseModel):
     auto_fix_action: Optional[str] = None
 
 
-class InternalScratchpad(BaseModel):
+@dataclass(slots=True)
+class InternalScratchpad:
     """
     Internal reasoning scratchpad - NEVER shown to user.
     Used for chain-of-thought processing.
     """
     # Planning phase
-    goals: List[str] = []
-    user_constraints: List[str] = []
-    steps: List[str] = []
+    goals: List[str] = field(default_factory=list)
+    user_constraints: List[str] = field(default_factory=list)
+    steps: List[str] = field(default_factory=list)
     
     # Tool execution phase
-    planned_tool_calls: List[ToolCallPlan] = []
-    completed_tool_calls: List[Dict[str, Any]] = []
+    planned_tool_calls: List[ToolCallPlan] = field(default_factory=list)
+    completed_tool_calls: List[Dict[str, Any]] = field(default_factory=list)
     
     # Risk assessment
-    identified_risks: List[str] = []
-    mitigation_strategies: List[str] = []
+    identified_risks: List[str] = field(default_factory=list)
+    mitigation_strategies: List[str] = field(default_factory=list)
     
     # Quality checks (pre-finalize)
-    quality_checks: List[QualityCheck] = []
+    quality_checks: List[QualityCheck] = field(default_factory=list)
     
     # Reasoning and decisions
-    key_decisions: List[str] = []
-    trade_offs: List[str] = []
-    assumptions: List[str] = []
+    key_decisions: List[str] = field(default_factory=list)
+    trade_offs: List[str] = field(default_factory=list)
+    assumptions: List[str] = field(default_factory=list)
     
     # Output preparation
     user_rationale: Optional[str] = None  # Short explanation for user
     confidence_level: str = "medium"  # high, medium, low
-    uncertainty_flags: List[str] = []
+    uncertainty_flags: List[str] = field(default_factory=list)
+
+
+# Static per-intent content, kept immutable and copied into each scratchpad
+_GOALS_BY_INTENT: Dict[ConversationIntent, Tuple[str, ...]] = {
+    ConversationIntent.PACKING_LIST: (
+        "Create comprehensive packing list",
+        "Consider weather conditions", 
+        "Account for activities and trip length",
+        "Optimize for luggage constraints"
+    ),
+    ConversationIntent.DESTINATION_RECOMMENDATION: (
+        "Find destinations matching user preferences",
+        "Consider budget and timing constraints",
+        "Verify travel feasibility", 
+        "Provide diverse options"
+    ),
+    ConversationIntent.ATTRACTIONS: (
+        "Identify relevant attractions",
+        "Consider time constraints",
+        "Plan logical routing",
+        "Include weather contingencies"
+    ),
+}
+
+_STEPS_BY_INTENT: Dict[ConversationIntent, Tuple[str, ...]] = {
+    ConversationIntent.PACKING_LIST: (
+        "1. Get weather forecast for destination and dates",
+        "2. Analyze planned activities and requirements", 
+        "3. Consider trip length and laundry availability",
+        "4. Generate category-based packing list",
+        "5. Add weather-specific items",
+        "6. Quality check for completeness"
+    ),
+    ConversationIntent.DESTINATION_RECOMMENDATION: (
+        "1. Analyze user preferences and constraints",
+        "2. Research potential destinations",
+        "3. Check weather and seasonal considerations",
+        "4. Evaluate budget feasibility",
+        "5. Rank options by match quality",
+        "6. Prepare recommendations with rationale"
+    ),
+    ConversationIntent.ATTRACTIONS: (
+        "1. Get destination information and highlights",
+        "2. Check weather forecast for visit period",
+        "3. Identify attractions matching user interests",
+        "4. Plan logical daily itineraries",
+        "5. Add indoor backup options",
+        "6. Validate time feasibility"
+    ),
+}
+
+# Quality check specs as (check_name, question, auto_fix_action). Callers record
+# results on the QualityCheck objects, so fresh ones are built from these per call
+_UNIVERSAL_QUALITY_CHECKS: Tuple[Tuple[str, str, str], ...] = (
+    ("constraint_compliance", "Have all user constraints been considered?",
+     "Review and adjust recommendations"),
+    ("weather_conflicts", "Are there any weather-related conflicts?",
+     "Add weather contingencies"),
+)
+
+_QUALITY_CHECKS_BY_INTENT: Dict[ConversationIntent, Tuple[Tuple[str, str, str], ...]] = {
+    ConversationIntent.PACKING_LIST: _UNIVERSAL_QUALITY_CHECKS + (
+        ("activity_coverage", "Does packing list cover all planned activities?",
+         "Add activity-specific items"),
+        ("weather_preparation", "Is user prepared for weather conditions?",
+         "Add weather-appropriate items"),
+    ),
+    ConversationIntent.ATTRACTIONS: _UNIVERSAL_QUALITY_CHECKS + (
+        ("time_feasibility", "Is the itinerary realistic for the time available?",
+         "Reduce activities or extend timeframes"),
+        ("indoor_backups", "Are there indoor alternatives for rainy days?",
+         "Add indoor attractions and activities"),
+    ),
+}
+
+
+# Placeholder forecast window for planned weather calls (replaced with actual dates)
+_WEATHER_PLACEHOLDER_DATES: Dict[str, str] = {
+    "start_date": "2024-06-01",
+    "end_date": "2024-06-07"
+}
+
+
+# (user_data key, formatter) pairs in output order; a formatter sees the
+# value only when it is truthy and returns None when there is no constraint
+_CONSTRAINT_EXTRACTORS: Tuple[Tuple[str, Callable[[Any], Optional[str]]], ...] = (
+    ("budget_band", lambda budget: f"Budget: {budget}"),
+    ("date_range", lambda dr: f"Trip length: {dr['duration_days']} days" if dr.get("duration_days") else None),
+    ("date_range", lambda dr: None if dr.get("flexible", True) else "Fixed travel dates"),
+    ("travelers", lambda travelers: "Traveling with children" if travelers.get("kids", 0) > 0 else None),
+    ("accommodation_type", lambda accommodation: f"Accommodation: {accommodation}"),
+)
 
 
 class ReasoningEngine:
@@ -77,29 +174,7 @@ class ReasoningEngine:
         scratchpad = InternalScratchpad()
         
         # Set goals based on intent
-        if intent == ConversationIntent.PACKING_LIST:
-            scratchpad.goals = [
-                "Create comprehensive packing list",
-                "Consider weather conditions", 
-                "Account for activities and trip length",
-                "Optimize for luggage constraints"
-            ]
-            
-        elif intent == ConversationIntent.DESTINATION_RECOMMENDATION:
-            scratchpad.goals = [
-                "Find destinations matching user preferences",
-                "Consider budget and timing constraints",
-                "Verify travel feasibility", 
-                "Provide diverse options"
-            ]
-            
-        elif intent == ConversationIntent.ATTRACTIONS:
-            scratchpad.goals = [
-                "Identify relevant attractions",
-                "Consider time constraints",
-                "Plan logical routing",
-                "Include weather contingencies"
-            ]
+        scratchpad.goals = list(_GOALS_BY_INTENT.get(intent, ()))
         
         # Extract user constraints
         scratchpad.user_constraints = ReasoningEngine._extract_constraints(user_data)
@@ -113,66 +188,20 @@ class ReasoningEngine:
     def _extract_constraints(user_data: Dict[str, Any]) -> List[str]:
         """Extract constraints from user data."""
         constraints = []
-        
-        if user_data.get("budget_band"):
-            constraints.append(f"Budget: {user_data['budget_band']}")
-            
-        if user_data.get("date_range"):
-            date_range = user_data["date_range"]
-            if date_range.get("duration_days"):
-                constraints.append(f"Trip length: {date_range['duration_days']} days")
-            if not date_range.get("flexible", True):
-                constraints.append("Fixed travel dates")
-                
-        if user_data.get("travelers"):
-            travelers = user_data["travelers"]
-            if travelers.get("kids", 0) > 0:
-                constraints.append("Traveling with children")
-                
-        if user_data.get("accommodation_type"):
-            constraints.append(f"Accommodation: {user_data['accommodation_type']}")
-            
+        for key, extract in _CONSTRAINT_EXTRACTORS:
+            value = user_data.get(key)
+            if value:
+                constraint = extract(value)
+                if constraint:
+                    constraints.append(constraint)
         return constraints
     
     @staticmethod
     def _plan_steps(intent: ConversationIntent, user_data: Dict[str, Any]) -> List[str]:
         """Plan execution steps based on intent."""
         
-        # No steps for general intent
-        if intent == ConversationIntent.GENERAL:
-            return []
-        
-        if intent == ConversationIntent.PACKING_LIST:
-            return [
-                "1. Get weather forecast for destination and dates",
-                "2. Analyze planned activities and requirements", 
-                "3. Consider trip length and laundry availability",
-                "4. Generate category-based packing list",
-                "5. Add weather-specific items",
-                "6. Quality check for completeness"
-            ]
-            
-        elif intent == ConversationIntent.DESTINATION_RECOMMENDATION:
-            return [
-                "1. Analyze user preferences and constraints",
-                "2. Research potential destinations",
-                "3. Check weather and seasonal considerations",
-                "4. Evaluate budget feasibility",
-                "5. Rank options by match quality",
-                "6. Prepare recommendations with rationale"
-            ]
-            
-        elif intent == ConversationIntent.ATTRACTIONS:
-            return [
-                "1. Get destination information and highlights",
-                "2. Check weather forecast for visit period",
-                "3. Identify attractions matching user interests",
-                "4. Plan logical daily itineraries",
-                "5. Add indoor backup options",
-                "6. Validate time feasibility"
-            ]
-        
-        return []
+        # No steps for general intent (or any intent without a plan)
+        return list(_STEPS_BY_INTENT.get(intent, ()))
     
     @staticmethod
     def plan_tool_calls(
@@ -189,11 +218,7 @@ class ReasoningEngine:
             tool_plans.append(ToolCallPlan(
                 tool_name="weather",
                 reasoning="Weather data needed for recommendations",
-                params={
-                    "city": user_data["destination"],
-                    "start_date": "2024-06-01",  # Will be replaced with actual dates
-                    "end_date": "2024-06-07"
-                },
+                params={"city": user_data["destination"], **_WEATHER_PLACEHOLDER_DATES},
                 priority=1,
                 required=True
             ))
@@ -231,52 +256,11 @@ class ReasoningEngine:
     def create_quality_checks(intent: ConversationIntent) -> List[QualityCheck]:
         """Create quality checks for pre-finalize validation."""
         
-        checks = []
-        
-        # Universal checks
-        checks.extend([
-            QualityCheck(
-                check_name="constraint_compliance",
-                question="Have all user constraints been considered?",
-                auto_fix_action="Review and adjust recommendations"
-            ),
-            QualityCheck(
-                check_name="weather_conflicts",
-                question="Are there any weather-related conflicts?",
-                auto_fix_action="Add weather contingencies"
-            )
-        ])
-        
-        # Intent-specific checks
-        if intent == ConversationIntent.PACKING_LIST:
-            checks.extend([
-                QualityCheck(
-                    check_name="activity_coverage",
-                    question="Does packing list cover all planned activities?",
-                    auto_fix_action="Add activity-specific items"
-                ),
-                QualityCheck(
-                    check_name="weather_preparation",
-                    question="Is user prepared for weather conditions?",
-                    auto_fix_action="Add weather-appropriate items"
-                )
-            ])
-            
-        elif intent == ConversationIntent.ATTRACTIONS:
-            checks.extend([
-                QualityCheck(
-                    check_name="time_feasibility",
-                    question="Is the itinerary realistic for the time available?",
-                    auto_fix_action="Reduce activities or extend timeframes"
-                ),
-                QualityCheck(
-                    check_name="indoor_backups",
-                    question="Are there indoor alternatives for rainy days?",
-                    auto_fix_action="Add indoor attractions and activities"
-                )
-            ])
-        
-        return checks
+        specs = _QUALITY_CHECKS_BY_INTENT.get(intent, _UNIVERSAL_QUALITY_CHECKS)
+        return [
+            QualityCheck(check_name=name, question=question, auto_fix_action=auto_fix_action)
+            for name, question, auto_fix_action in specs
+        ]
     
     @staticmethod
     def generate_user_rationale(scratchpad: InternalScratchpad) -> str:
@@ -2,17 +2,19 @@
 Conversation state machine for modular service approach.
 Each service (destination, packing, attractions) follows the same phase pattern.
 """
-from typing import  Dict, List, Optional, Set
+import re
+from functools import lru_cache
+from typing import  Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 from app.schemas import ConversationIntent, ConversationPhase
 
 
 # Universal phase transitions (same for all services)
-VALID_TRANSITIONS: Dict[ConversationPhase, List[ConversationPhase]] = {
-    ConversationPhase.INTENT_DETECTION: [ConversationPhase.DATA_COLLECTION],
-    ConversationPhase.DATA_COLLECTION: [ConversationPhase.PROCESSING, ConversationPhase.INTENT_DETECTION],  # Can go back if intent changes
-    ConversationPhase.PROCESSING: [ConversationPhase.REFINEMENT, ConversationPhase.DATA_COLLECTION],  # Can go back if missing data
-    ConversationPhase.REFINEMENT: [ConversationPhase.COMPLETED, ConversationPhase.PROCESSING],  # Can regenerate or complete
-    ConversationPhase.COMPLETED: [ConversationPhase.INTENT_DETECTION]  # Can start new service
+VALID_TRANSITIONS: Dict[ConversationPhase, FrozenSet[ConversationPhase]] = {
+    ConversationPhase.INTENT_DETECTION: frozenset({ConversationPhase.DATA_COLLECTION}),
+    ConversationPhase.DATA_COLLECTION: frozenset({ConversationPhase.PROCESSING, ConversationPhase.INTENT_DETECTION}),  # Can go back if intent changes
+    ConversationPhase.PROCESSING: frozenset({ConversationPhase.REFINEMENT, ConversationPhase.DATA_COLLECTION}),  # Can go back if missing data
+    ConversationPhase.REFINEMENT: frozenset({ConversationPhase.COMPLETED, ConversationPhase.PROCESSING}),  # Can regenerate or complete
+    ConversationPhase.COMPLETED: frozenset({ConversationPhase.INTENT_DETECTION})  # Can start new service
 }
 
 # Required data slots per service and phase
@@ -48,11 +50,11 @@ REQUIRED_SLOTS: Dict[ConversationIntent, Dict[ConversationPhase, List[str]]] = {
 }
 
 # Minimum required slots to proceed to processing for each service
-MINIMUM_SLOTS_FOR_PROCESSING: Dict[ConversationIntent, List[str]] = {
-    ConversationIntent.DESTINATION_RECOMMENDATION: ["user_preferences"],
-    ConversationIntent.PACKING_LIST: ["destination_or_climate", "travelers"],
-    ConversationIntent.ATTRACTIONS: ["destination"],
-    ConversationIntent.GENERAL: []
+MINIMUM_SLOTS_FOR_PROCESSING: Dict[ConversationIntent, FrozenSet[str]] = {
+    ConversationIntent.DESTINATION_RECOMMENDATION: frozenset({"user_preferences"}),
+    ConversationIntent.PACKING_LIST: frozenset({"destination_or_climate", "travelers"}),
+    ConversationIntent.ATTRACTIONS: frozenset({"destination"}),
+    ConversationIntent.GENERAL: frozenset()
 }
 
 # Questions to ask per service when data is missing
@@ -78,11 +80,154 @@ SERVICE_QUESTIONS: Dict[ConversationIntent, Dict[str, str]] = {
     }
 }
 
+# Lowercased forms for building aggregated questions, computed once
+_LOWER_SERVICE_QUESTIONS: Dict[ConversationIntent, Dict[str, str]] = {
+    intent: {slot: question.lower() for slot, question in questions.items()}
+    for intent, questions in SERVICE_QUESTIONS.items()
+}
+_SERVICE_NAME_LC: Dict[ConversationIntent, str] = {
+    intent: intent.value.replace("_", " ").title().lower() for intent in ConversationIntent
+}
+
+# Question priority order for each service
+_QUESTION_PRIORITY: Dict[ConversationIntent, Tuple[str, ...]] = {
+    ConversationIntent.DESTINATION_RECOMMENDATION: (
+        "user_preferences", "date_range", "destination_criteria", "departure_location"
+    ),
+    ConversationIntent.PACKING_LIST: (
+        "destination_or_climate", "travelers", "date_range", "activities_planned", "accommodation_info"
+    ),
+    ConversationIntent.ATTRACTIONS: (
+        "destination", "visit_duration", "attraction_types", "user_preferences"
+    )
+}
+
+# (slot, question) pairs in priority order, resolved once per service
+_PRIORITIZED_QUESTIONS: Dict[ConversationIntent, Tuple[Tuple[str, str], ...]] = {
+    intent: tuple(
+        (slot, SERVICE_QUESTIONS[intent][slot])
+        for slot in _QUESTION_PRIORITY.get(intent, tuple(SERVICE_QUESTIONS[intent]))
+        if slot in SERVICE_QUESTIONS[intent]
+    )
+    for intent in SERVICE_QUESTIONS
+}
+
+# What each service does, as told to the user
+_SERVICE_DESCRIPTIONS: Dict[ConversationIntent, str] = {
+    ConversationIntent.DESTINATION_RECOMMENDATION: "I'll help you find the perfect destination based on your preferences, budget, and travel style.",
+    ConversationIntent.PACKING_LIST: "I'll create a personalized packing list based on your destination, activities, and travel details.",
+    ConversationIntent.ATTRACTIONS: "I'll suggest attractions and activities for your destination with a personalized itinerary.",
+    ConversationIntent.GENERAL: "I can help you with destination recommendations, packing lists, or attraction suggestions. What would you like to start with?"
+}
+_DEFAULT_SERVICE_DESCRIPTION = "How can I help you plan your trip?"
+
 # Data that can be shared between services
 SHAREABLE_DATA: Set[str] = {
     "travelers", "date_range", "user_preferences", "budget_band", 
     "destination", "climate_preference", "interests"
 }
+_SHAREABLE_DATA_FIELDS: Tuple[str, ...] = tuple(sorted(SHAREABLE_DATA))
+
+
+def _as_set(collected_slots: Iterable[str]) -> Set[str]:
+    """Collected slots as a set, so each membership check is a hash lookup."""
+    return collected_slots if isinstance(collected_slots, (set, frozenset)) else set(collected_slots)
+
+
+def _keyword_pattern(*keywords: str) -> re.Pattern:
+    """Compile lowercase keywords into one substring alternation."""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+# Intent keywords, each matched as a substring of the lowercased message
+_ATTRACTION_RE = _keyword_pattern(
+    "attractions", "things to do", "activities", "sightseeing",
+    "places to visit", "museums", "galleries", "what can i visit",
+    "best attractions", "looking for museums", "what to see", "tourist spots",
+    "recommendations for activities", "attraction recommendations"
+)
+_FEATURED_CITY_RE = _keyword_pattern("paris", "tokyo", "london", "rome", "barcelona", "amsterdam")
+_PACKING_RE = _keyword_pattern(
+    "pack", "packing", "what to bring", "luggage", "suitcase",
+    "backpack", "what should i take", "packing list",
+    "packing recommendations", "what to pack"
+)
+_DESTINATION_RE = _keyword_pattern(
+    "where to go", "choose a destination", "suggest a place",
+    "where should i travel", "help me choose", "pick a destination",
+    "where to visit", "destination recommendations", "suggest somewhere",
+    "travel destination", "vacation destination"
+)
+_DESTINATION_CONTEXT_RE = _keyword_pattern("destination", "place", "somewhere", "where")
+
+
+def _next_phase_rule(
+    current_phase: ConversationPhase,
+    is_general: bool,
+    can_proceed: bool,
+    has_results: bool
+) -> ConversationPhase:
+    """Phase progression rules, evaluated once per input combination to build _NEXT_PHASE."""
+    if current_phase == ConversationPhase.INTENT_DETECTION:
+        # Move to data collection once intent is clear
+        return ConversationPhase.INTENT_DETECTION if is_general else ConversationPhase.DATA_COLLECTION
+        
+    elif current_phase == ConversationPhase.DATA_COLLECTION:
+        # Move to processing if we have minimum required data
+        return ConversationPhase.PROCESSING if can_proceed else ConversationPhase.DATA_COLLECTION
+            
+    elif current_phase == ConversationPhase.PROCESSING:
+        # Move to refinement once we have results
+        return ConversationPhase.REFINEMENT if has_results else ConversationPhase.PROCESSING
+        
+    elif current_phase == ConversationPhase.REFINEMENT:
+        # User can choose to complete or ask for modifications
+        return ConversationPhase.REFINEMENT  # Stay here until user explicitly completes
+        
+    elif current_phase == ConversationPhase.COMPLETED:
+        # Can start a new service
+        return ConversationPhase.INTENT_DETECTION
+        
+    return current_phase
+
+
+# Next phase keyed by (current phase, intent is GENERAL, has minimum data, has results)
+_NEXT_PHASE: Dict[Tuple[ConversationPhase, bool, bool, bool], ConversationPhase] = {
+    (phase, is_general, can_proceed, has_results): _next_phase_rule(phase, is_general, can_proceed, has_results)
+    for phase in ConversationPhase
+    for is_general in (False, True)
+    for can_proceed in (False, True)
+    for has_results in (False, True)
+}
+
+
+def _classify_intent(message_lower: str) -> ConversationIntent:
+    """Keyword intent classification of an already lowercased message."""
+    # Attractions first, with the most specific patterns, to avoid false positives
+    # (a "recommendations" + attraction-word match is already covered by _ATTRACTION_RE)
+    if (_ATTRACTION_RE.search(message_lower) or
+        ("looking for" in message_lower and _FEATURED_CITY_RE.search(message_lower))):
+        return ConversationIntent.ATTRACTIONS
+    
+    # Packing list keywords (check before destination to avoid "recommend" false positive)
+    if _PACKING_RE.search(message_lower):
+        return ConversationIntent.PACKING_LIST
+    
+    # Only trigger destination if it's clearly about choosing a destination (not just "recommend")
+    if (_DESTINATION_RE.search(message_lower) or
+        ("recommend" in message_lower and _DESTINATION_CONTEXT_RE.search(message_lower))):
+        return ConversationIntent.DESTINATION_RECOMMENDATION
+    
+    return ConversationIntent.GENERAL
+
+
+# Messages longer than this skip the intent cache, to bound its memory
+MAX_CACHED_INTENT_MESSAGE_LENGTH = 512
+
+
+@lru_cache(maxsize=1024)
+def _classify_intent_cached(message_lower: str) -> ConversationIntent:
+    return _classify_intent(message_lower)
 
 
 class ConversationStateManager:
@@ -102,13 +247,14 @@ class ConversationStateManager:
     def get_missing_slots(intent: ConversationIntent, phase: ConversationPhase, collected_slots: List[str]) -> List[str]:
         """Get list of missing required slots for a service/phase."""
         required = REQUIRED_SLOTS.get(intent, {}).get(phase, [])
-        return [slot for slot in required if slot not in collected_slots]
+        collected = _as_set(collected_slots)
+        return [slot for slot in required if slot not in collected]
     
     @staticmethod
     def can_proceed_to_processing(intent: ConversationIntent, collected_slots: List[str]) -> bool:
         """Check if we have minimum data to start processing."""
-        minimum_required = MINIMUM_SLOTS_FOR_PROCESSING.get(intent, [])
-        return all(slot in collected_slots for slot in minimum_required)
+        minimum_required = MINIMUM_SLOTS_FOR_PROCESSING.get(intent, frozenset())
+        return minimum_required.issubset(collected_slots)
     
     @staticmethod
     def determine_next_phase(
@@ -118,40 +264,23 @@ class ConversationStateManager:
         has_results: bool = False
     ) -> ConversationPhase:
         """Determine the next phase based on current state."""
-        
-        if current_phase == ConversationPhase.INTENT_DETECTION:
-            # Move to data collection once intent is clear
-            return ConversationPhase.DATA_COLLECTION if current_intent != ConversationIntent.GENERAL else ConversationPhase.INTENT_DETECTION
-            
-        elif current_phase == ConversationPhase.DATA_COLLECTION:
-            # Move to processing if we have minimum required data
-            if ConversationStateManager.can_proceed_to_processing(current_intent, collected_slots):
-                return ConversationPhase.PROCESSING
-            else:
-                return ConversationPhase.DATA_COLLECTION
-                
-        elif current_phase == ConversationPhase.PROCESSING:
-            # Move to refinement once we have results
-            return ConversationPhase.REFINEMENT if has_results else ConversationPhase.PROCESSING
-            
-        elif current_phase == ConversationPhase.REFINEMENT:
-            # User can choose to complete or ask for modifications
-            return ConversationPhase.REFINEMENT  # Stay here until user explicitly completes
-            
-        elif current_phase == ConversationPhase.COMPLETED:
-            # Can start a new service
-            return ConversationPhase.INTENT_DETECTION
-            
-        return current_phase
+        key = (
+            current_phase,
+            current_intent == ConversationIntent.GENERAL,
+            ConversationStateManager.can_proceed_to_processing(current_intent, collected_slots),
+            bool(has_results)
+        )
+        return _NEXT_PHASE.get(key, current_phase)
     
     @staticmethod
     def get_next_questions(intent: ConversationIntent, collected_slots: List[str]) -> List[str]:
         """Get all missing questions to ask at once for better UX."""
         service_questions = SERVICE_QUESTIONS.get(intent, {})
+        collected = _as_set(collected_slots)
         
         missing_questions = []
         for slot, question in service_questions.items():
-            if slot not in collected_slots:
+            if slot not in collected:
                 missing_questions.append(question)
                 
         return missing_questions
@@ -159,59 +288,47 @@ class ConversationStateManager:
     @staticmethod
     def get_aggregated_question(intent: ConversationIntent, collected_slots: List[str]) -> Optional[str]:
         """Get a single aggregated question asking for all missing information."""
-        missing_questions = ConversationStateManager.get_next_questions(intent, collected_slots)
+        collected = _as_set(collected_slots)
+        missing_slots = [slot for slot in SERVICE_QUESTIONS.get(intent, {}) if slot not in collected]
         
-        if not missing_questions:
+        if not missing_slots:
             return None
             
-        if len(missing_questions) == 1:
-            return missing_questions[0]
+        if len(missing_slots) == 1:
+            return SERVICE_QUESTIONS[intent][missing_slots[0]]
             
-        # Create an aggregated question
-        service_name = intent.value.replace("_", " ").title()
+        # Create an aggregated question from the pre-lowered questions
+        lowered = _LOWER_SERVICE_QUESTIONS[intent]
+        service_name = _SERVICE_NAME_LC[intent]
         
-        if len(missing_questions) == 2:
-            return f"To provide the best {service_name.lower()}, I need to know: {missing_questions[0].lower()} and {missing_questions[1].lower()}"
+        if len(missing_slots) == 2:
+            return f"To provide the best {service_name}, I need to know: {lowered[missing_slots[0]]} and {lowered[missing_slots[1]]}"
         else:
-            questions_text = ", ".join([q.lower() for q in missing_questions[:-1]])
-            questions_text += f", and {missing_questions[-1].lower()}"
-            return f"To provide the best {service_name.lower()}, I need to know: {questions_text}"
+            questions_text = ", ".join([lowered[slot] for slot in missing_slots[:-1]])
+            questions_text += f", and {lowered[missing_slots[-1]]}"
+            return f"To provide the best {service_name}, I need to know: {questions_text}"
     
     @staticmethod
     def get_prioritized_questions(intent: ConversationIntent, collected_slots: List[str], max_questions: int = 3) -> List[str]:
         """Get the most important questions first, limited to max_questions."""
         
-        # Define priority order for each service
-        priority_order = {
-            ConversationIntent.DESTINATION_RECOMMENDATION: [
-                "user_preferences", "date_range", "destination_criteria", "departure_location"
-            ],
-            ConversationIntent.PACKING_LIST: [
-                "destination_or_climate", "travelers", "date_range", "activities_planned", "accommodation_info"
-            ],
-            ConversationIntent.ATTRACTIONS: [
-                "destination", "visit_duration", "attraction_types", "user_preferences"
-            ]
-        }
-        
-        service_questions = SERVICE_QUESTIONS.get(intent, {})
-        priority_slots = priority_order.get(intent, list(service_questions.keys()))
+        collected = _as_set(collected_slots)
         
         # For attractions, if we have destination, reduce questions significantly
-        if intent == ConversationIntent.ATTRACTIONS and "destination" in collected_slots:
+        if intent == ConversationIntent.ATTRACTIONS and "destination" in collected:
             max_questions = min(max_questions, 1)  # Only ask 1 more question if destination is known
         
         # Get questions in priority order, limited to max_questions
         prioritized_questions = []
-        for slot in priority_slots:
-            if slot not in collected_slots and slot in service_questions:
-                prioritized_questions.append(service_questions[slot])
+        for slot, question in _PRIORITIZED_QUESTIONS.get(intent, ()):
+            if slot not in collected:
+                prioritized_questions.append(question)
                 if len(prioritized_questions) >= max_questions:
                     break
         
         # If we have enough data for processing, don't ask too many questions
-        minimum_required = MINIMUM_SLOTS_FOR_PROCESSING.get(intent, [])
-        has_minimum = all(slot in collected_slots for slot in minimum_required)
+        minimum_required = MINIMUM_SLOTS_FOR_PROCESSING.get(intent, frozenset())
+        has_minimum = minimum_required.issubset(collected)
         if has_minimum and len(prioritized_questions) > 1:
             prioritized_questions = prioritized_questions[:1]  # Only ask 1 more question
                     
@@ -221,61 +338,46 @@ class ConversationStateManager:
     def detect_intent_from_message(message: str) -> ConversationIntent:
         """Context-aware intent detection from user message."""
         message_lower = message.lower()
-        
-        # More specific attraction patterns (check first to avoid false positives)
-        attraction_patterns = [
-            "attractions", "things to do", "activities", "sightseeing",
-            "places to visit", "museums", "galleries", "what can i visit",
-            "best attractions", "looking for museums", "what to see", "tourist spots",
-            "recommendations for activities", "attraction recommendations"
-        ]
-        
-        # Check for attractions intent with specific context
-        if (any(pattern in message_lower for pattern in attraction_patterns) or
-            ("recommendations" in message_lower and any(word in message_lower for word in ["attractions", "activities", "museums", "things to do"])) or
-            ("looking for" in message_lower and any(city in message_lower for city in ["paris", "tokyo", "london", "rome", "barcelona", "amsterdam"]))):
-            return ConversationIntent.ATTRACTIONS
-        
-        # Packing list keywords (check before destination to avoid "recommend" false positive)
-        packing_patterns = [
-            "pack", "packing", "what to bring", "luggage", "suitcase", 
-            "backpack", "what should i take", "packing list",
-            "packing recommendations", "what to pack"
-        ]
-        if any(pattern in message_lower for pattern in packing_patterns):
-            return ConversationIntent.PACKING_LIST
-        
-        # Destination recommendation keywords (more specific now)
-        destination_patterns = [
-            "where to go", "choose a destination", "suggest a place", 
-            "where should i travel", "help me choose", "pick a destination",
-            "where to visit", "destination recommendations", "suggest somewhere",
-            "travel destination", "vacation destination"
-        ]
-        
-        # Only trigger destination if it's clearly about choosing a destination (not just "recommend")
-        if (any(pattern in message_lower for pattern in destination_patterns) or
-            ("recommend" in message_lower and any(word in message_lower for word in ["destination", "place", "somewhere", "where"]))):
-            return ConversationIntent.DESTINATION_RECOMMENDATION
-        
-        return ConversationIntent.GENERAL
+        if len(message_lower) <= MAX_CACHED_INTENT_MESSAGE_LENGTH:
+            # Repeated openers ("help me pack", "things to do in paris") hit the cache
+            return _classify_intent_cached(message_lower)
+        return _classify_intent(message_lower)
     
     @staticmethod
-    def can_share_data_between_services(from_intent: ConversationIntent, to_intent: ConversationIntent) -> List[str]:
+    def can_share_data_between_services(from_intent: ConversationIntent, to_intent: ConversationIntent) -> Tuple[str, ...]:
         """Determine what data can be shared when switching between services."""
         # For now, all services can share the common data
-        return list(SHAREABLE_DATA)
+        return _SHAREABLE_DATA_FIELDS
     
     @staticmethod
     def get_service_description(intent: ConversationIntent) -> str:
         """Get description of what each service does."""
-        descriptions = {
-            ConversationIntent.DESTINATION_RECOMMENDATION: "I'll help you find the perfect destination based on your preferences, budget, and travel style.",
-            ConversationIntent.PACKING_LIST: "I'll create a personalized packing list based on your destination, activities, and travel details.",
-            ConversationIntent.ATTRACTIONS: "I'll suggest attractions and activities for your destination with a personalized itinerary.",
-            ConversationIntent.GENERAL: "I can help you with destination recommendations, packing lists, or attraction suggestions. What would you like to start with?"
-        }
-        return descriptions.get(intent, "How can I help you plan your trip?")
+        return _SERVICE_DESCRIPTIONS.get(intent, _DEFAULT_SERVICE_DESCRIPTION)
+    
+    @staticmethod
+    def get_service_bootstrap(
+        intent: ConversationIntent,
+        phase: ConversationPhase,
+        max_questions: int = 3
+    ) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+        """
+        Get (description, opening questions, required slots) for starting a service
+        with nothing collected yet. Fixed per (intent, phase), so it is memoized.
+        """
+        return _service_bootstrap(intent, phase, max_questions)
+
+
+@lru_cache(maxsize=128)
+def _service_bootstrap(
+    intent: ConversationIntent,
+    phase: ConversationPhase,
+    max_questions: int
+) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+    return (
+        ConversationStateManager.get_service_description(intent),
+        tuple(ConversationStateManager.get_prioritized_questions(intent, [], max_questions)),
+        tuple(ConversationStateManager.get_required_slots(intent, phase)),
+    )
 
 
 # Maximum questions per service before forcing progression
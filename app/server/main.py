@@ -1,21 +1,42 @@
 """
 FastAPI server main application.
 """
+import asyncio
+import atexit
 import logging
+import queue
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.core.config import settings
+from app.agents.orchestrator import get_orchestrator
+from app.core.config import get_settings
 from app.database.connection import create_tables
 from app.server.routes import conversations
 
-# Configure logging
+settings = get_settings()
+
+# Configure logging. The format below never uses thread, process or task
+# names, so skip collecting them for every record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging.logAsyncioTasks = False
+# Request threads only format the record and enqueue it; a background
+# listener thread does the (possibly blocking) write to stderr
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[QueueHandler(_log_queue)],
 )
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +46,11 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     logger.info("🚀 Starting Trip Planner Agent API...")
-    create_tables()
+    # Warm up the orchestrator (LLM clients, tools) while the tables are checked
+    await asyncio.gather(
+        asyncio.to_thread(create_tables),
+        asyncio.to_thread(get_orchestrator),
+    )
     logger.info("✅ Database tables created/verified")
     
     yield
@@ -56,22 +81,28 @@ app.add_middleware(
 app.include_router(conversations.router, prefix="/api/v1", tags=["conversations"])
 
 
-@app.get("/")
-async def root():
+# Both probe bodies are static, so they are serialized once at import
+_ROOT_BODY = orjson.dumps({
+    "message": "Trip Planner Agent API",
+    "version": "1.0.0",
+    "status": "healthy",
+    "environment": settings.ENVIRONMENT
+})
+
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "database": "connected",
+    "timestamp": "2024-01-01T00:00:00Z"
+})
+
+
+@app.get("/", response_model=Dict[str, str])
+async def root() -> Response:
     """Health check endpoint."""
-    return {
-        "message": "Trip Planner Agent API",
-        "version": "1.0.0",
-        "status": "healthy",
-        "environment": settings.ENVIRONMENT
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
-@app.get("/health")
-async def health_check():
+@app.get("/health", response_model=Dict[str, str])
+async def health_check() -> Response:
     """Detailed health check."""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "timestamp": "2024-01-01T00:00:00Z"
-    }
\ No newline at end of file
+    return Response(content=_HEALTH_BODY, media_type="application/json")
@@ -1,9 +1,13 @@
 """
 FastAPI routes for conversation management.
+Routes are plain functions: the database session and the orchestrator's
+LLM calls block, so FastAPI runs them in its threadpool instead of
+stalling the event loop.
 """
 import json
 import logging
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -28,9 +32,40 @@ from app.schemas.state import ConversationStateManager
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Opening message for conversations that start without a specific intent
+_GENERAL_GREETING = (
+    "Hello! I'm your trip planning assistant. I can help you with:\n\n"
+    "• **Destination recommendations** - Find the perfect place to travel\n"
+    "• **Packing lists** - Get personalized packing suggestions\n"
+    "• **Attractions & activities** - Discover things to do at your destination\n\n"
+    "What would you like help with today?"
+)
+
+# Every general-intent start gets this response; only the conversation_id differs
+_GENERAL_START_RESPONSE = StartConversationResponse(
+    conversation_id="",
+    message=_GENERAL_GREETING,
+    intent=ConversationIntent.GENERAL,
+    phase=ConversationPhase.INTENT_DETECTION,
+    next_required=["intent_selection"]
+)
+
+_INTENT_BY_VALUE: Dict[str, ConversationIntent] = {intent.value: intent for intent in ConversationIntent}
+
+
+@lru_cache(maxsize=64)
+def _parse_services_completed(raw: str) -> Tuple[ConversationIntent, ...]:
+    """Parse a stored services_completed JSON list; the few distinct values repeat across rows."""
+    return tuple(_INTENT_BY_VALUE[service] for service in json.loads(raw))
+
+
+def _services_completed(raw: Optional[str]) -> List[ConversationIntent]:
+    """Completed services for a conversation row (column may be NULL)."""
+    return list(_parse_services_completed(raw)) if raw else []
+
 
 @router.post("/conversations", response_model=StartConversationResponse)
-async def start_conversation(
+def start_conversation(
     request: StartConversationRequest,
     db: Session = Depends(get_db)
 ) -> StartConversationResponse:
@@ -75,74 +110,69 @@ async def start_conversation(
         else:
             detected_intent = request.initial_intent or ConversationIntent.GENERAL
         
-        # Create new conversation
+        # Create new conversation (added and committed together with its first turn below)
+        conversation_id = str(uuid4())
+        phase = ConversationPhase.INTENT_DETECTION if detected_intent == ConversationIntent.GENERAL else ConversationPhase.DATA_COLLECTION
         conversation = Conversation(
-            id=str(uuid4()),
+            id=conversation_id,
             user_id=request.user_id,
             status=ConversationStatus.ACTIVE,
             current_intent=detected_intent,
-            current_phase=ConversationPhase.INTENT_DETECTION if detected_intent == ConversationIntent.GENERAL else ConversationPhase.DATA_COLLECTION
+            current_phase=phase
         )
         
-        db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
-        
         # Generate appropriate response message
         if detected_intent == ConversationIntent.GENERAL:
-            message = "Hello! I'm your trip planning assistant. I can help you with:\n\n• **Destination recommendations** - Find the perfect place to travel\n• **Packing lists** - Get personalized packing suggestions\n• **Attractions & activities** - Discover things to do at your destination\n\nWhat would you like help with today?"
-            next_required = ["intent_selection"]
+            message = _GENERAL_GREETING
         else:
-            service_description = ConversationStateManager.get_service_description(detected_intent)
+            # Description, initial questions and required slots for the detected service
+            service_description, missing_questions, next_required = (
+                ConversationStateManager.get_service_bootstrap(detected_intent, phase, max_questions=3)
+            )
             message = f"Great! {service_description}"
             
-            # Get initial questions for the detected service
-            missing_questions = ConversationStateManager.get_prioritized_questions(
-                detected_intent, [], max_questions=3
-            )
             if missing_questions:
                 if len(missing_questions) == 1:
                     message += f"\n\nTo get started, {missing_questions[0].lower()}"
                 else:
                     questions_text = "\n".join([f"• {q}" for q in missing_questions])
                     message += f"\n\nTo get started, I need to know:\n{questions_text}"
-            
-            next_required = ConversationStateManager.get_required_slots(
-                detected_intent, conversation.current_phase
-            )
         
         # Create initial turn
         initial_turn = Turn(
             id=str(uuid4()),
-            conversation_id=conversation.id,
+            conversation_id=conversation_id,
             turn_number=1,
             user_message=request.initial_message,
             agent_response=message,
             intent=detected_intent,
-            phase=conversation.current_phase
+            phase=phase
         )
         
-        db.add(initial_turn)
+        db.add_all([conversation, initial_turn])
         db.commit()
         
-        logger.info(f"Started conversation {conversation.id} with intent {detected_intent}")
+        logger.info("Started conversation %s with intent %s", conversation_id, detected_intent)
+        
+        if detected_intent == ConversationIntent.GENERAL:
+            return _GENERAL_START_RESPONSE.model_copy(update={"conversation_id": conversation_id})
         
         return StartConversationResponse(
-            conversation_id=conversation.id,
+            conversation_id=conversation_id,
             message=message,
             intent=detected_intent,
-            phase=conversation.current_phase,
+            phase=phase,
             next_required=next_required
         )
         
     except Exception as e:
-        logger.error(f"Error starting conversation: {e}")
+        logger.error("Error starting conversation: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to start conversation")
 
 
 @router.post("/conversations/{conversation_id}/message", response_model=SendMessageResponse)
-async def send_message(
+def send_message(
     conversation_id: str,
     request: SendMessageRequest,
     db: Session = Depends(get_db)
@@ -152,9 +182,7 @@ async def send_message(
     """
     try:
         # Get conversation
-        conversation = db.query(Conversation).filter(
-            Conversation.id == conversation_id
-        ).first()
+        conversation = db.get(Conversation, conversation_id)
         
         if not conversation:
             raise HTTPException(status_code=404, detail="Conversation not found")
@@ -167,13 +195,15 @@ async def send_message(
         agent_response = orchestrator.process_user_message(
             conversation_id, 
             request.message, 
-            db
+            db,
+            commit=False
         )
         
         # Update conversation phase if changed
         if agent_response.next_phase:
             conversation.current_phase = agent_response.next_phase
-            db.commit()
+        intent = conversation.current_intent
+        phase = conversation.current_phase
         
         # Get turn count for this conversation
         turn_count = db.query(Turn).filter(
@@ -187,23 +217,22 @@ async def send_message(
             turn_number=turn_count + 1,
             user_message=request.message,
             agent_response=agent_response.message,
-            intent=conversation.current_intent,
-            phase=conversation.current_phase
+            intent=intent,
+            phase=phase
         )
         
         db.add(new_turn)
-        db.commit()
         
-        # Update conversation timestamp
+        # Orchestrator state, phase change, new turn and timestamp go out in one transaction
         conversation.updated_at = func.now()
         db.commit()
         
-        logger.info(f"Processed message for conversation {conversation_id}")
+        logger.info("Processed message for conversation %s", conversation_id)
         
         return SendMessageResponse(
             agent_response=agent_response.message,
-            intent=conversation.current_intent,
-            phase=conversation.current_phase,
+            intent=intent,
+            phase=phase,
             next_required=[],  # Will be implemented later
             missing_slots=[],
             tool_outputs=[],
@@ -214,13 +243,13 @@ async def send_message(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing message: {e}")
+        logger.error("Error processing message: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to process message")
 
 
 @router.get("/conversations/{conversation_id}", response_model=GetConversationResponse)
-async def get_conversation(
+def get_conversation(
     conversation_id: str,
     db: Session = Depends(get_db)
 ) -> GetConversationResponse:
@@ -228,22 +257,17 @@ async def get_conversation(
     Get conversation summary and current state.
     """
     try:
-        conversation = db.query(Conversation).filter(
+        # Load the conversation and its turn count in one round-trip
+        row = db.query(Conversation, func.count(Turn.id)).outerjoin(
+            Turn, Turn.conversation_id == Conversation.id
+        ).filter(
             Conversation.id == conversation_id
-        ).first()
+        ).group_by(Conversation.id).first()
         
-        if not conversation:
+        if not row:
             raise HTTPException(status_code=404, detail="Conversation not found")
         
-        # Get turn count
-        turn_count = db.query(Turn).filter(
-            Turn.conversation_id == conversation_id
-        ).count()
-        
-        # Parse completed services
-        completed_services = []
-        if conversation.services_completed:
-            completed_services = json.loads(conversation.services_completed)
+        conversation, turn_count = row
         
         return GetConversationResponse(
             conversation_id=conversation.id,
@@ -252,7 +276,7 @@ async def get_conversation(
             synopsis=conversation.synopsis,
             current_intent=conversation.current_intent,
             current_phase=conversation.current_phase,
-            services_completed=[ConversationIntent(service) for service in completed_services],
+            services_completed=_services_completed(conversation.services_completed),
             destination_recommendations=None,  # Will be populated when available
             packing_list=None,
             attractions_suggestions=None,
@@ -262,12 +286,12 @@ async def get_conversation(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting conversation: {e}")
+        logger.error("Error getting conversation: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get conversation")
 
 
 @router.post("/conversations/{conversation_id}/resume", response_model=SendMessageResponse)
-async def resume_conversation(
+def resume_conversation(
     conversation_id: str,
     db: Session = Depends(get_db)
 ) -> SendMessageResponse:
@@ -295,12 +319,12 @@ async def resume_conversation(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in resume endpoint: {e}")
+        logger.error("Error in resume endpoint: %s", e)
         raise HTTPException(status_code=500, detail="Failed to resume conversation")
 
 
 @router.get("/conversations/{conversation_id}/context")
-async def get_conversation_context(
+def get_conversation_context(
     conversation_id: str,
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
@@ -329,9 +353,9 @@ async def get_conversation_context(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting conversation context: {e}")
+        logger.error("Error getting conversation context: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get conversation context")
-async def list_conversations(
+def list_conversations(
     user_id: str = None,
     limit: int = 50,
     db: Session = Depends(get_db)
@@ -340,25 +364,20 @@ async def list_conversations(
     List conversations, optionally filtered by user_id.
     """
     try:
-        query = db.query(Conversation)
+        # Turn counts come back with the conversations, not one query per row
+        query = db.query(Conversation, func.count(Turn.id)).outerjoin(
+            Turn, Turn.conversation_id == Conversation.id
+        )
         
         if user_id:
             query = query.filter(Conversation.user_id == user_id)
         
-        conversations = query.order_by(
+        rows = query.group_by(Conversation.id).order_by(
             Conversation.updated_at.desc()
         ).limit(limit).all()
         
         result = []
-        for conv in conversations:
-            turn_count = db.query(Turn).filter(
-                Turn.conversation_id == conv.id
-            ).count()
-            
-            completed_services = []
-            if conv.services_completed:
-                completed_services = json.loads(conv.services_completed)
-            
+        for conv, turn_count in rows:
             result.append(GetConversationResponse(
                 conversation_id=conv.id,
                 status=conv.status,
@@ -366,7 +385,7 @@ async def list_conversations(
                 synopsis=conv.synopsis,
                 current_intent=conv.current_intent,
                 current_phase=conv.current_phase,
-                services_completed=[ConversationIntent(service) for service in completed_services],
+                services_completed=_services_completed(conv.services_completed),
                 destination_recommendations=None,
                 packing_list=None,
                 attractions_suggestions=None,
@@ -376,5 +395,5 @@ async def list_conversations(
         return result
         
     except Exception as e:
-        logger.error(f"Error listing conversations: {e}")
+        logger.error("Error listing conversations: %s", e)
         raise HTTPException(status_code=500, detail="Failed to list conversations")
\ No newline at end of file
@@ -1,21 +1,65 @@
 """
 LLM-powered attraction recommendation tool.
 """
+import copy
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, Iterator, List, Any, Optional
 
 from app.tools.base import BaseTool, ToolResult
-from app.core.llm_client import get_factual_llm
+from app.core import ollama_raw
 
 logger = logging.getLogger(__name__)
 
+# The prompt asks for 5-8 attractions; generation is cut off once this many are complete
+MAX_ATTRACTIONS = 8
+
+# Output token ceiling for one attractions generation
+ATTRACTIONS_MAX_TOKENS = 1500
+
+_SYSTEM_PROMPT = "You are a knowledgeable, honest travel advisor."
+
+# Fixed instructions lead the prompt and the trip details follow, so Ollama can
+# reuse the cached prefix across requests and only prefill the short tail
+_ATTRACTION_FORMAT = """List 5-8 specific attractions you are confident exist, each as:
+
+ATTRACTION_NAME: [Name]
+TYPE: [museum/beach/park/historic site/restaurant/market/etc]
+DESCRIPTION: [2-3 sentences]
+WHY_RECOMMENDED: [fit with their interests/family]
+PRACTICAL_INFO: [hours, fees, location]
+FAMILY_FRIENDLY: [Yes/No and why]
+
+If you cannot recommend attractions for the destination, reply only: INSUFFICIENT_DATA: [reason]
+
+"""
+
+# Line label -> attraction key, for the "LABEL: value" lines of the format above
+_ATTRACTION_FIELDS = {
+    "ATTRACTION_NAME": "name",
+    "TYPE": "type",
+    "DESCRIPTION": "description",
+    "WHY_RECOMMENDED": "why_recommended",
+    "PRACTICAL_INFO": "practical_info",
+    "FAMILY_FRIENDLY": "family_friendly",
+}
+
+# Maximum number of parsed LLM generations kept in memory
+ATTRACTIONS_GENERATION_CACHE_SIZE = 128
+
+# Parsed attractions keyed by prompt. The prompt only carries what shapes the
+# generation (destination, interests, family, duration, budget), so requests that
+# differ in traveler names, exact ages or notes reuse one generation
+_generation_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_generation_cache_lock = threading.Lock()
+
 
 class AttractionsTool(BaseTool):
     """LLM-powered attraction recommendations."""
     
     def __init__(self):
         super().__init__("attractions", cache_ttl_hours=24)  # Cache for 24h since attractions don't change often
-        self.llm = get_factual_llm()
     
     def _execute(
         self,
@@ -114,24 +158,37 @@ class AttractionsTool(BaseTool):
         # Build comprehensive prompt
         prompt = self._build_attraction_prompt(destination, context)
         
+        with _generation_cache_lock:
+            cached = _generation_cache.get(prompt)
+            if cached is not None:
+                _generation_cache.move_to_end(prompt)
+        if cached is not None:
+            logger.debug(f"Reusing generated attractions for {destination}")
+            return copy.deepcopy(cached)
+        
         try:
-            response = self.llm.chat.completions.create(
-                model="llama3.1:8b",
-                messages=[{
-                    "role": "system",
-                    "content": "You are a knowledgeable travel advisor. Provide specific, accurate attraction recommendations based on the user's requirements. If you cannot provide good recommendations for a destination, be honest about it."
-                }, {
-                    "role": "user", 
-                    "content": prompt
-                }],
+            # Stream the completion and parse attraction blocks as their lines arrive,
+            # so generation stops as soon as enough attractions are complete
+            fragments = ollama_raw.stream_generate(
+                prompt,
+                system=_SYSTEM_PROMPT,
                 temperature=0.3,  # Lower temperature for more consistent recommendations
-                max_tokens=1500
+                num_predict=ATTRACTIONS_MAX_TOKENS
             )
+            try:
+                attractions_data = self._parse_llm_lines(self._iter_lines(fragments), destination)
+            finally:
+                # Drops the connection if parsing stopped early, ending the generation
+                fragments.close()
             
-            content = response.choices[0].message.content.strip()
+            # Only usable generations are kept so refusals and parse failures are retried
+            if attractions_data:
+                with _generation_cache_lock:
+                    _generation_cache[prompt] = copy.deepcopy(attractions_data)
+                    if len(_generation_cache) > ATTRACTIONS_GENERATION_CACHE_SIZE:
+                        _generation_cache.popitem(last=False)
             
-            # Parse the LLM response into structured data
-            return self._parse_llm_response(content, destination, context)
+            return attractions_data
             
         except Exception as e:
             logger.error(f"LLM call failed for attractions: {e}")
@@ -140,78 +197,75 @@ class AttractionsTool(BaseTool):
     def _build_attraction_prompt(self, destination: str, context: Dict[str, Any]) -> str:
         """Build detailed prompt for LLM attraction generation."""
         
-        prompt = f"Generate specific attraction recommendations for {destination}.\n\n"
+        parts = [_ATTRACTION_FORMAT, f"Destination: {destination}\n"]
         
         # Add context
         if context.get("interests"):
             interests_str = ", ".join(context["interests"])
-            prompt += f"Traveler interests: {interests_str}\n"
+            parts.append(f"Traveler interests: {interests_str}\n")
         
         if context.get("is_family_trip"):
-            prompt += f"Family trip: {context.get('family_composition', 'family group')}\n"
+            parts.append(f"Family trip: {context.get('family_composition', 'family group')}\n")
             
         if context.get("needs_child_friendly"):
-            prompt += "IMPORTANT: Must include child-friendly and family-suitable attractions.\n"
+            parts.append("IMPORTANT: Must include child-friendly and family-suitable attractions.\n")
             
         if context.get("duration"):
-            prompt += f"Trip duration: {context['duration']} days\n"
+            parts.append(f"Trip duration: {context['duration']} days\n")
             
-        prompt += f"Budget level: {context.get('budget_level', 'mid-range')}\n\n"
-        
-        prompt += """Please provide 5-8 specific attractions with the following format for each:
-
-ATTRACTION_NAME: [Name]
-TYPE: [museum/beach/park/historic site/restaurant/market/etc]
-DESCRIPTION: [2-3 sentence description]
-WHY_RECOMMENDED: [Why this fits their interests/family needs]
-PRACTICAL_INFO: [Opening hours, entry fees, location details]
-FAMILY_FRIENDLY: [Yes/No and why]
-
-If you cannot provide good recommendations for this destination, respond with: "INSUFFICIENT_DATA: [reason why recommendations cannot be provided]"
-
-Be specific and accurate. Only recommend attractions you are confident exist."""
+        parts.append(f"Budget level: {context.get('budget_level', 'mid-range')}")
         
-        return prompt
+        return "".join(parts)
     
-    def _parse_llm_response(self, content: str, destination: str, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Parse LLM response into structured data."""
-        
-        # Check if LLM indicated insufficient data
-        if "INSUFFICIENT_DATA:" in content:
-            logger.info(f"LLM indicated insufficient data for {destination}")
-            return None
-        
-        # Parse attractions from response
+    @staticmethod
+    def _iter_lines(fragments: Iterable[str]) -> Iterator[str]:
+        """Reassemble streamed text fragments into complete lines."""
+        buffer = ""
+        for fragment in fragments:
+            buffer += fragment
+            *lines, buffer = buffer.split('\n')
+            yield from lines
+        if buffer:
+            yield buffer
+    
+    def _parse_llm_lines(self, lines: Iterable[str], destination: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse attraction blocks from LLM output lines. Stops reading once
+        MAX_ATTRACTIONS blocks are complete, which ends a streamed generation.
+        """
         attractions = []
         current_attraction = {}
         
-        lines = content.split('\n')
-        
         for line in lines:
             line = line.strip()
             if not line:
                 continue
+            
+            # Check if LLM indicated insufficient data
+            if "INSUFFICIENT_DATA:" in line:
+                logger.info(f"LLM indicated insufficient data for {destination}")
+                return None
                 
-            if line.startswith('ATTRACTION_NAME:'):
+            label, _, value = line.partition(':')
+            field = _ATTRACTION_FIELDS.get(label)
+            if field is None:
+                continue
+            value = value.strip()
+            
+            if field == 'name':
                 # Save previous attraction if exists
                 if current_attraction.get('name'):
                     attractions.append(current_attraction)
                 # Start new attraction
-                current_attraction = {
-                    'name': line.replace('ATTRACTION_NAME:', '').strip()
-                }
-            elif line.startswith('TYPE:'):
-                current_attraction['type'] = line.replace('TYPE:', '').strip()
-            elif line.startswith('DESCRIPTION:'):
-                current_attraction['description'] = line.replace('DESCRIPTION:', '').strip()
-            elif line.startswith('WHY_RECOMMENDED:'):
-                current_attraction['why_recommended'] = line.replace('WHY_RECOMMENDED:', '').strip()
-            elif line.startswith('PRACTICAL_INFO:'):
-                current_attraction['practical_info'] = line.replace('PRACTICAL_INFO:', '').strip()
-            elif line.startswith('FAMILY_FRIENDLY:'):
-                family_friendly_text = line.replace('FAMILY_FRIENDLY:', '').strip()
-                current_attraction['family_friendly'] = family_friendly_text.lower().startswith('yes')
-                current_attraction['family_friendly_notes'] = family_friendly_text
+                current_attraction = {'name': value}
+            elif field == 'family_friendly':
+                current_attraction['family_friendly'] = value.lower().startswith('yes')
+                current_attraction['family_friendly_notes'] = value
+                # FAMILY_FRIENDLY is the last field of a block
+                if current_attraction.get('name') and len(attractions) + 1 >= MAX_ATTRACTIONS:
+                    break
+            else:
+                current_attraction[field] = value
         
         # Don't forget the last attraction
         if current_attraction.get('name'):
@@ -239,12 +293,9 @@ Be specific and accurate. Only recommend attractions you are confident exist."""
                 attractions = family_friendly_attractions
         
         # Categorize attractions by type
-        categories = {}
+        categories = defaultdict(list)
         for attraction in attractions:
-            attraction_type = attraction.get('type', 'other')
-            if attraction_type not in categories:
-                categories[attraction_type] = []
-            categories[attraction_type].append(attraction)
+            categories[attraction.get('type', 'other')].append(attraction)
         
         # Create summary
         summary = f"Found {len(attractions)} attractions in {destination}"
@@ -255,7 +306,7 @@ Be specific and accurate. Only recommend attractions you are confident exist."""
         
         return {
             "attractions": attractions,
-            "categories": categories,
+            "categories": dict(categories),
             "destination": destination,
             "summary": summary,
             "total_count": len(attractions),
@@ -273,12 +324,10 @@ Be specific and accurate. Only recommend attractions you are confident exist."""
         cache_key = self._get_cache_key(**kwargs)
         
         # Check cache first
-        if cache_key in self._cache:
-            cached_result = self._cache[cache_key]
-            if self._is_cache_valid(cached_result):
-                logger.info(f"Returning cached attractions for {kwargs.get('destination')}")
-                cached_result.cached = True
-                return cached_result
+        cached_result = self._get_from_cache(cache_key)
+        if cached_result:
+            logger.info(f"Returning cached attractions for {kwargs.get('destination')}")
+            return cached_result
         
         # Execute and cache
         result = self._execute(**kwargs)
@@ -288,6 +337,17 @@ Be specific and accurate. Only recommend attractions you are confident exist."""
         return result
 
 
+# Global attractions tool instance, shared so its result cache survives between calls
+_attractions_tool: Optional[AttractionsTool] = None
+_attractions_tool_lock = threading.Lock()
+
+
 def get_attractions_tool() -> AttractionsTool:
-    """Factory function to get attractions tool instance."""
-    return AttractionsTool()
\ No newline at end of file
+    """Get the attractions tool instance, creating it on first use."""
+    global _attractions_tool
+    if _attractions_tool is None:
+        # First calls can race on worker threads; a second instance would split the cache
+        with _attractions_tool_lock:
+            if _attractions_tool is None:
+                _attractions_tool = AttractionsTool()
+    return _attractions_tool
\ No newline at end of file
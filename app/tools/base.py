@@ -1,8 +1,12 @@
 """
 Base tool class for all travel planning tools.
 """
+import hashlib
+import inspect
 import logging
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
@@ -10,6 +14,28 @@ from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of results each tool keeps cached; least recently used go first
+TOOL_CACHE_SIZE = 1024
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Normalize a tool parameter for cache keys: strings are stripped and
+    casefolded, string lists/sets become sorted tuples, and dicts are
+    ordered by key, so equivalent requests ("Paris" vs "paris ",
+    ["food", "art"] vs ["art", "food"]) share one cache entry.
+    """
+    if isinstance(value, str):
+        return value.strip().casefold()
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_canonical(v) for v in value]
+        if all(isinstance(v, str) for v in items):
+            items.sort()
+        return tuple(items)
+    return value
+
 
 class ToolResult(BaseModel):
     """Standard result format for all tools."""
@@ -24,17 +50,36 @@ class ToolResult(BaseModel):
 class BaseTool(ABC):
     """Base class for all tools."""
     
-    def __init__(self, name: str, cache_ttl_hours: int = 6):
+    def __init__(
+        self,
+        name: str,
+        cache_ttl_hours: int = 6,
+        cache_size: int = TOOL_CACHE_SIZE,
+        negative_cache_ttl_minutes: int = 0
+    ):
         self.name = name
         self.cache_ttl_hours = cache_ttl_hours
-        self._cache: Dict[str, ToolResult] = {}
+        self.negative_cache_ttl_minutes = negative_cache_ttl_minutes  # 0 = never cache failures
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, ToolResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Parameters defaulting to None: passing None is the same call as omitting them
+        self._none_default_params = frozenset(
+            param.name for param in inspect.signature(self._execute).parameters.values()
+            if param.default is None
+        )
     
     def _get_cache_key(self, **params) -> str:
         """Generate cache key from parameters."""
-        # Sort params for consistent keys
+        # Sort params and normalize values for consistent keys
         sorted_params = sorted(params.items())
-        key_parts = [f"{k}={v}" for k, v in sorted_params]
-        return f"{self.name}:" + "|".join(key_parts)
+        key_parts = [
+            f"{k}={_canonical(v)!r}" for k, v in sorted_params
+            if not (v is None and k in self._none_default_params)
+        ]
+        # Hash to a fixed-size key; some params (e.g. weather data) are large
+        digest = hashlib.blake2b("|".join(key_parts).encode(), digest_size=16).hexdigest()
+        return f"{self.name}:{digest}"
     
     def _is_cache_valid(self, result: ToolResult) -> bool:
         """Check if cached result is still valid."""
@@ -44,25 +89,38 @@ class BaseTool(ABC):
     
     def _get_from_cache(self, cache_key: str) -> Optional[ToolResult]:
         """Get result from cache if valid."""
-        if cache_key in self._cache:
-            cached_result = self._cache[cache_key]
-            if self._is_cache_valid(cached_result):
-                logger.debug(f"Cache hit for {cache_key}")
-                cached_result.cached = True
-                return cached_result
-            else:
+        with self._cache_lock:
+            cached_result = self._cache.get(cache_key)
+            if cached_result is None:
+                return None
+            if not self._is_cache_valid(cached_result):
                 # Remove expired cache entry
                 del self._cache[cache_key]
                 logger.debug(f"Cache expired for {cache_key}")
-        return None
+                return None
+            self._cache.move_to_end(cache_key)
+        logger.debug(f"Cache hit for {cache_key}")
+        # Flag a shallow copy; the stored result is shared between threads
+        return cached_result.model_copy(update={"cached": True})
     
-    def _store_in_cache(self, cache_key: str, result: ToolResult):
-        """Store result in cache."""
-        result.cache_expires_at = datetime.now() + timedelta(hours=self.cache_ttl_hours)
+    def _store_in_cache(self, cache_key: str, result: ToolResult, ttl: Optional[timedelta] = None):
+        """Store result in cache (for cache_ttl_hours unless a ttl is given)."""
+        result.cache_expires_at = datetime.now() + (ttl or timedelta(hours=self.cache_ttl_hours))
         result.cached = False
-        self._cache[cache_key] = result
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
         logger.debug(f"Cached result for {cache_key}")
     
+    def _is_cacheable_failure(self, result: ToolResult) -> bool:
+        """
+        Whether a failed result is a definitive answer (e.g. unknown city) rather
+        than a transient error. Only these are negatively cached.
+        """
+        return False
+    
     @abstractmethod
     def _execute(self, **params) -> ToolResult:
         """Execute the tool logic. Must be implemented by subclasses."""
@@ -86,9 +144,14 @@ class BaseTool(ABC):
             logger.info(f"Executing {self.name} with params: {params}")
             result = self._execute(**params)
             
-            # Cache successful results
+            # Cache successful results, and definitive failures briefly so
+            # repeated bad inputs don't redo every lookup
             if result.success:
                 self._store_in_cache(cache_key, result)
+            elif self.negative_cache_ttl_minutes and self._is_cacheable_failure(result):
+                self._store_in_cache(
+                    cache_key, result, ttl=timedelta(minutes=self.negative_cache_ttl_minutes)
+                )
             
             return result
             
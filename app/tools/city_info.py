@@ -3,23 +3,52 @@ City information tool using Wikipedia API with LLM fallback.
 """
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from typing import Optional
 
 import httpx
 from app.tools.base import BaseTool, ToolResult
-from app.core.config import settings
-from app.core.llm_client import get_factual_llm
+from app.core.config import get_settings
+from app.core import ollama_raw
 
 logger = logging.getLogger(__name__)
 
+# Wikipedia overview cleanup patterns
+_PARENTHETICAL_RE = re.compile(r'\([^)]*\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Lookup errors meaning the city is genuinely unknown, as opposed to timeouts, outages
+# or an unparseable LLM reply
+_DEFINITIVE_MISS_ERRORS = (
+    "No Wikipedia page found",
+    "LLM doesn't know",
+)
+
+# Pool for probing Wikipedia title variations concurrently after a 404
+_PROBE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="wikipedia-probe")
+
 
 class CityInfoTool(BaseTool):
     """Tool for getting city information using Wikipedia API."""
     
     def __init__(self):
-        super().__init__("city_info", cache_ttl_hours=settings.CACHE_TTL_HOURS)
+        settings = get_settings()
+        # Unknown cities are remembered for 5 minutes, then re-probed in case a page appears
+        super().__init__(
+            "city_info", cache_ttl_hours=settings.CACHE_TTL_HOURS, negative_cache_ttl_minutes=5
+        )
         self.base_url = settings.WIKIPEDIA_API_URL
         self.timeout = settings.TOOL_TIMEOUT_SECONDS
-        self.factual_llm = get_factual_llm()
+        # Shared across requests so keep-alive connections to Wikipedia are reused
+        self._client = httpx.Client(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60),
+        )
+    
+    def _is_cacheable_failure(self, result: ToolResult) -> bool:
+        """High-confidence failures mean both sources reported the city as unknown."""
+        return result.confidence == "high"
     
     def _get_city_info_from_api(self, city: str) -> tuple[bool, dict]:
         """
@@ -30,31 +59,47 @@ class CityInfoTool(BaseTool):
             # First, search for the page
             search_url = f"{self.base_url}/page/summary/{city}"
             
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(search_url)
+            response = self._client.get(search_url)
+            
+            if response.status_code == 404:
+                # Try with common variations, all at once; the earliest variation
+                # in this order that resolves wins. The bare name already 404'd.
+                variations = [
+                    f"{city} city",
+                    f"{city}, France" if "paris" in city.lower() else f"{city}",
+                    f"{city} (city)"
+                ]
+                probes = [
+                    _PROBE_EXECUTOR.submit(self._client.get, f"{self.base_url}/page/summary/{variation}")
+                    for variation in dict.fromkeys(variations) if variation != city
+                ]
                 
-                if response.status_code == 404:
-                    # Try with common variations
-                    variations = [
-                        f"{city} city",
-                        f"{city}, France" if "paris" in city.lower() else f"{city}",
-                        f"{city} (city)"
-                    ]
-                    
-                    for variation in variations:
-                        try:
-                            search_url = f"{self.base_url}/page/summary/{variation}"
-                            response = client.get(search_url)
-                            if response.status_code == 200:
-                                break
-                        except:
-                            continue
-                    else:
-                        return False, {"error": f"No Wikipedia page found for {city}"}
+                # Only a clean 404 from every probe means there is no page
+                probe_failed = False
+                for probe in probes:
+                    try:
+                        probe_response = probe.result()
+                    except Exception as e:
+                        logger.warning(f"Wikipedia probe failed for {city}: {e}")
+                        probe_failed = True
+                        continue
+                    if probe_response.status_code == 200:
+                        response = probe_response
+                        break
+                    if probe_response.status_code != 404:
+                        probe_failed = True
+                else:
+                    if probe_failed:
+                        return False, {"error": f"Wikipedia lookup incomplete for {city}"}
+                    return False, {"error": f"No Wikipedia page found for {city}"}
                 
-                response.raise_for_status()
-                data = response.json()
+                # Skip probes that haven't started; the rest finish on the shared client
+                for probe in probes:
+                    probe.cancel()
             
+            response.raise_for_status()
+            data = response.json()
+        
             # Extract relevant information
             overview = data.get("extract", "")
             if not overview:
@@ -110,67 +155,88 @@ highlights: Tokyo Skytree, Senso-ji Temple, Shibuya Crossing
 safety: generally safe, very low crime rate
 best_months: March-May, September-November"""
 
-            response = self.factual_llm.invoke(prompt)
-            logger.debug(f"LLM city info response for {city}: {response}")
-            
-            # Parse the response
-            lines = response.strip().split('\n')
-            
-            if any('none' in line.lower() for line in lines):
-                return False, {"error": f"LLM doesn't know about '{city}'"}
-            
-            overview = ""
-            highlights = []
-            safety = ""
-            best_months = ""
-            
-            for line in lines:
-                line = line.strip()
-                
-                if line.startswith('overview:'):
-                    overview = line.split(':', 1)[1].strip()
-                elif line.startswith('highlights:'):
-                    highlights_str = line.split(':', 1)[1].strip()
-                    highlights = [h.strip() for h in highlights_str.split(',')]
-                elif line.startswith('safety:'):
-                    safety = line.split(':', 1)[1].strip()
-                elif line.startswith('best_months:'):
-                    best_months = line.split(':', 1)[1].strip()
-            
-            if not overview:
-                return False, {"error": f"LLM couldn't provide useful info for '{city}'"}
-            
-            result = {
-                "overview": overview,
-                "highlights": highlights,
-                "caution": [safety] if safety and safety != "generally safe" else [],
-                "best_months": best_months.split(', ') if best_months else [],
-                "source": "LLM knowledge"
-            }
+            # A configured small model answers most well-known cities faster; when it
+            # doesn't know the city, fall through to the main model
+            fast_model = get_settings().OLLAMA_FAST_MODEL
+            if fast_model:
+                try:
+                    response = ollama_raw.generate(prompt, num_predict=256, model=fast_model)
+                except Exception as e:
+                    # Includes malformed response bodies, not just HTTP errors
+                    logger.warning(f"Fast LLM {fast_model} failed for {city}: {e}")
+                else:
+                    logger.debug(f"Fast LLM city info response for {city}: {response}")
+                    success, data = self._parse_llm_city_info(city, response)
+                    if success:
+                        return success, data
             
-            return True, result
+            response = ollama_raw.generate(prompt, num_predict=256)
+            logger.debug(f"LLM city info response for {city}: {response}")
+            return self._parse_llm_city_info(city, response)
             
         except Exception as e:
             logger.error(f"LLM city info error for {city}: {e}")
             return False, {"error": f"LLM failed: {str(e)}"}
     
+    def _parse_llm_city_info(self, city: str, response: str) -> tuple[bool, dict]:
+        """
+        Parse the line-formatted LLM city overview.
+        Returns (success, data)
+        """
+        lines = response.strip().split('\n')
+            
+        if any('none' in line.lower() for line in lines):
+            return False, {"error": f"LLM doesn't know about '{city}'"}
+        
+        overview = ""
+        highlights = []
+        safety = ""
+        best_months = ""
+        
+        for line in lines:
+            line = line.strip()
+            
+            if line.startswith('overview:'):
+                overview = line.split(':', 1)[1].strip()
+            elif line.startswith('highlights:'):
+                highlights_str = line.split(':', 1)[1].strip()
+                highlights = [h.strip() for h in highlights_str.split(',')]
+            elif line.startswith('safety:'):
+                safety = line.split(':', 1)[1].strip()
+            elif line.startswith('best_months:'):
+                best_months = line.split(':', 1)[1].strip()
+        
+        if not overview:
+            return False, {"error": f"LLM couldn't provide useful info for '{city}'"}
+        
+        result = {
+            "overview": overview,
+            "highlights": highlights,
+            "caution": [safety] if safety and safety != "generally safe" else [],
+            "best_months": best_months.split(', ') if best_months else [],
+            "source": "LLM knowledge"
+        }
+        
+        return True, result
+    
     def _clean_overview(self, text: str) -> str:
         """Clean and truncate Wikipedia overview text."""
         # Remove common Wikipedia markup
-        text = re.sub(r'\([^)]*\)', '', text)  # Remove parenthetical content
-        text = re.sub(r'\s+', ' ', text)       # Normalize whitespace
+        text = _PARENTHETICAL_RE.sub('', text)  # Remove parenthetical content
+        text = _WHITESPACE_RE.sub(' ', text)    # Normalize whitespace
         text = text.strip()
         
         # Truncate to reasonable length for travel info
         if len(text) > 500:
-            sentences = text.split('. ')
-            truncated = ""
-            for sentence in sentences:
-                if len(truncated + sentence) < 400:
-                    truncated += sentence + ". "
+            kept = []
+            length = 0
+            for sentence in text.split('. '):
+                if length + len(sentence) < 400:
+                    kept.append(sentence + ". ")
+                    length += len(sentence) + 2
                 else:
                     break
-            text = truncated.strip()
+            text = "".join(kept).strip()
         
         return text
     
@@ -186,6 +252,7 @@ best_months: March-May, September-November"""
         
         # Try Wikipedia API first
         success, data = self._get_city_info_from_api(city)
+        api_error = data.get("error", "")
         if success:
             logger.debug(f"Used Wikipedia API for {city}")
             
@@ -209,6 +276,7 @@ best_months: March-May, September-November"""
         # Fallback to LLM
         logger.info(f"Wikipedia API failed for {city}, trying LLM fallback")
         success, data = self._get_city_info_from_llm(city)
+        llm_error = data.get("error", "")
         if success:
             logger.info(f"Used LLM fallback for city info: {city}")
             
@@ -223,12 +291,13 @@ best_months: March-May, September-November"""
                 confidence="medium"
             )
         
-        # Both failed
+        # Both failed; only confident it's unknown if neither source had an outage
+        definitive = api_error.startswith(_DEFINITIVE_MISS_ERRORS) and llm_error.startswith(_DEFINITIVE_MISS_ERRORS)
         return ToolResult(
             success=False,
             error=f"Could not find information about '{city}' via Wikipedia or LLM. "
                   f"Please check the city name or try a nearby major city.",
-            confidence="high",
+            confidence="high" if definitive else "low",
             data={
                 "overview": f"General info unavailable for {city}. Consider researching major attractions, "
                            f"local customs, and current travel advisories before visiting.",
@@ -241,10 +310,18 @@ best_months: March-May, September-November"""
         )
 
 
-# Global city info tool instance
-_city_info_tool = CityInfoTool()
+# Global city info tool instance, created on first use since it owns a pooled
+# HTTP client that should be opened in the serving process, not at import
+_city_info_tool: Optional[CityInfoTool] = None
+_city_info_tool_lock = threading.Lock()
 
 
 def get_city_info_tool() -> CityInfoTool:
-    """Get the city info tool instance."""
-    return _city_info_tool
\ No newline at end of file
+    """Get the city info tool instance, creating it on first use."""
+    global _city_info_tool
+    if _city_info_tool is None:
+        # First calls can race on worker threads; a second instance would leak its client
+        with _city_info_tool_lock:
+            if _city_info_tool is None:
+                _city_info_tool = CityInfoTool()
+    return _city_info_tool
@@ -2,11 +2,12 @@
 Destination recommendation tool using LLM intelligence.
 """
 import logging
+import threading
 from typing import Dict, List, Any, Optional
 import json
 
 from app.tools.base import BaseTool, ToolResult
-from app.core.config import settings
+from app.core.config import get_settings
 from app.core.llm_client import get_llm
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,7 @@ class DestinationRecommendationTool(BaseTool):
     """Tool for recommending travel destinations using LLM intelligence."""
     
     def __init__(self):
+        settings = get_settings()
         super().__init__("destination_recommendation", cache_ttl_hours=settings.CACHE_TTL_HOURS)
         self.llm = get_llm()
     
@@ -279,10 +281,18 @@ Focus on destinations that genuinely match their interests. Consider seasonality
         return summary
 
 
-# Global destination recommendation tool instance
-_destination_tool = DestinationRecommendationTool()
+# Global destination recommendation tool instance, created on first use so that
+# importing app.tools doesn't build the LLM client
+_destination_tool: Optional[DestinationRecommendationTool] = None
+_destination_tool_lock = threading.Lock()
 
 
 def get_destination_tool() -> DestinationRecommendationTool:
-    """Get the destination recommendation tool instance."""
-    return _destination_tool
\ No newline at end of file
+    """Get the destination recommendation tool instance, creating it on first use."""
+    global _destination_tool
+    if _destination_tool is None:
+        # First calls can race on worker threads; build only one instance
+        with _destination_tool_lock:
+            if _destination_tool is None:
+                _destination_tool = DestinationRecommendationTool()
+    return _destination_tool
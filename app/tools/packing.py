@@ -2,7 +2,8 @@
 Rule-based packing recommendation tool.
 """
 import logging
-from typing import Dict, List, Any
+import threading
+from typing import Dict, List, Any, Optional
 
 from app.tools.base import BaseTool, ToolResult
 
@@ -420,10 +421,17 @@ class PackingTool(BaseTool):
         return " ".join(notes)
 
 
-# Global packing tool instance
-_packing_tool = PackingTool()
+# Global packing tool instance, created on first use like the other tool singletons
+_packing_tool: Optional[PackingTool] = None
+_packing_tool_lock = threading.Lock()
 
 
 def get_packing_tool() -> PackingTool:
-    """Get the packing tool instance."""
+    """Get the packing tool instance, creating it on first use."""
+    global _packing_tool
+    if _packing_tool is None:
+        # First calls can race on worker threads; build only one instance
+        with _packing_tool_lock:
+            if _packing_tool is None:
+                _packing_tool = PackingTool()
     return _packing_tool
\ No newline at end of file
@@ -2,13 +2,14 @@
 Weather tool using Open-Meteo free API.
 """
 import logging
+import threading
 from datetime import datetime, date
 from typing import List, Optional
 
 import httpx
 from app.tools.base import BaseTool, ToolResult
-from app.core.config import settings
-from app.core.llm_client import get_factual_llm
+from app.core.config import get_settings
+from app.core import ollama_raw
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +18,10 @@ class WeatherTool(BaseTool):
     """Tool for getting weather forecasts using Open-Meteo API."""
     
     def __init__(self):
+        settings = get_settings()
         super().__init__("weather", cache_ttl_hours=settings.CACHE_TTL_HOURS)
         self.base_url = settings.OPENMETEO_BASE_URL
         self.timeout = settings.TOOL_TIMEOUT_SECONDS
-        self.factual_llm = get_factual_llm()
     
     def _validate_dates(self, start_date: str, end_date: str) -> tuple[bool, str]:
         """Validate date inputs."""
@@ -105,7 +106,7 @@ latitude: 48.8566
 longitude: 2.3522
 location: Paris, France"""
 
-            response = self.factual_llm.invoke(prompt)
+            response = ollama_raw.generate(prompt, num_predict=64)
             logger.debug(f"LLM geocoding response for {city}: {response}")
             
             # Parse the response
@@ -312,10 +313,18 @@ location: Paris, France"""
         return weather_codes.get(code, f"Weather code {code}")
 
 
-# Global weather tool instance
-_weather_tool = WeatherTool()
+# Global weather tool instance, created on first use so that
+# importing app.tools doesn't load settings
+_weather_tool: Optional[WeatherTool] = None
+_weather_tool_lock = threading.Lock()
 
 
 def get_weather_tool() -> WeatherTool:
-    """Get the weather tool instance."""
+    """Get the weather tool instance, creating it on first use."""
+    global _weather_tool
+    if _weather_tool is None:
+        # First calls can race on worker threads; build only one instance
+        with _weather_tool_lock:
+            if _weather_tool is None:
+                _weather_tool = WeatherTool()
     return _weather_tool
\ No newline at end of file
@@ -20,6 +20,23 @@ def test_validator():
         # Should fail - scope  
         ("Help me with my programming homework", ConversationIntent.GENERAL, False),
         ("What's the weather like?", ConversationIntent.PACKING_LIST, True),  # In context
+        
+        # Repeats with different case/whitespace share the cached check
+        ("  HOW TO SMUGGLE ITEMS ACROSS BORDERS ", ConversationIntent.GENERAL, False),
+        ("help me with my PROGRAMMING homework", ConversationIntent.GENERAL, False),
+        
+        # Blank and very long messages
+        ("   ", ConversationIntent.GENERAL, False),
+        ("Plan my trip to Lisbon. " * 200 + "Then help me smuggle souvenirs", ConversationIntent.GENERAL, False),
+        
+        # Keywords match whole words only ("hi" is not found inside "this")
+        ("this", ConversationIntent.GENERAL, False),
+        ("Any flights?", ConversationIntent.GENERAL, True),
+        
+        # Inflected travel words still count, even next to an off-topic word
+        ("What medical documents do travelers need for Japan?", ConversationIntent.GENERAL, True),
+        ("Backpacking Europe", ConversationIntent.GENERAL, True),
+        ("Packed yet?", ConversationIntent.GENERAL, True),
     ]
     
     print("🧪 Testing Validator...")